@@ -1,3 +1,28 @@
-from django.test import TestCase
+from django.test import RequestFactory, SimpleTestCase, override_settings
 
-# Create your tests here.
+from .views import DoctorListView, search_cache_key
+
+
+class SearchCacheKeyTests(SimpleTestCase):
+    def test_spelling_variants_share_a_key(self):
+        self.assertEqual(
+            search_cache_key({'name': '  Budi   Santoso ', 'page': 0}, 'token-a'),
+            search_cache_key({'name': 'budi santoso', 'page': 0}, 'token-a'),
+        )
+
+    @override_settings(SEARCH_CACHE_CASEFOLD=False)
+    def test_case_is_kept_when_casefold_is_off(self):
+        self.assertNotEqual(
+            search_cache_key({'name': 'Budi'}, 'token-a'),
+            search_cache_key({'name': 'budi'}, 'token-a'),
+        )
+
+    def test_key_is_scoped_to_the_token(self):
+        params = {'speciality': 'Umum', 'page': 0, 'size': 12}
+        keys = {search_cache_key(params, token) for token in ('token-a', 'token-b', None)}
+        self.assertEqual(len(keys), 3)
+
+    def test_backend_receives_the_term_as_typed(self):
+        request = RequestFactory().get('/doctors/', {'name': '  Budi Santoso ', 'speciality': 'Gigi'})
+        params = DoctorListView()._search_params(request, {})
+        self.assertEqual(params, {'name': 'Budi Santoso', 'speciality': 'Gigi'})
@@ -1,9 +1,14 @@
+from django.conf import settings
 from django.urls import path
 from doctor_profile import views
 
 app_name = 'doctor_profile'
 
+DoctorListView = views.AsyncDoctorListView if settings.ASYNC_VIEWS else views.DoctorListView
+DoctorListFragmentView = views.AsyncDoctorListFragmentView if settings.ASYNC_VIEWS else views.DoctorListFragmentView
+
 urlpatterns = [
-    path('', views.DoctorListView.as_view(), name='search'),
+    path('', DoctorListView.as_view(), name='search'),
+    path('fragment/', DoctorListFragmentView.as_view(), name='search_fragment'),
     path('<uuid:doctor_id>/', views.DoctorProfileView.as_view(), name='detail'),
 ]
\ No newline at end of file
@@ -1,15 +1,102 @@
+from django.http import JsonResponse
 from django.shortcuts import render, redirect
+from django.template.loader import render_to_string
 from django.views import View
 from django.contrib import messages
+from django.conf import settings
+import json
 import uuid
 from urllib.parse import urlencode
+from asgiref.sync import sync_to_async
 from main.views import api_request, get_base_context, is_logged_in
+from pandacare.async_api_client import async_api_request, async_session_data
+from pandacare.cache import MISSING, LRUCache
+from pandacare.http_cache import cached_render
+from pandacare.profiles import get_doctor_profile
+from pandacare.singleflight import token_scope
+
+search_cache = LRUCache(
+    maxsize=getattr(settings, 'SEARCH_CACHE_MAXSIZE', 256),
+    ttl=getattr(settings, 'SEARCH_CACHE_TTL', 60),
+    name='doctor_search',
+)
+
+# Free-text params whose spelling variants share a cache entry
+SEARCH_TEXT_PARAMS = ('name', 'speciality')
+
+
+def normalize_search_value(value):
+    """Collapse whitespace and, if SEARCH_CACHE_CASEFOLD, case-fold a free-text term.
+
+    Only used for the cache key; the backend receives the term as typed.
+    """
+    value = ' '.join(str(value).split())
+    return value.casefold() if getattr(settings, 'SEARCH_CACHE_CASEFOLD', True) else value
+
+
+def search_cache_key(params, token):
+    """Normalized query, scoped to the caller's token like every other cached upstream response"""
+    query = tuple(sorted(
+        (name, normalize_search_value(value) if name in SEARCH_TEXT_PARAMS else value)
+        for name, value in params.items()
+    ))
+    return query, token_scope(token)
+
+
+def cache_search_result(key, response):
+    """Store a search response unless it exceeds SEARCH_CACHE_MAX_ENTRY_BYTES"""
+    if not response:
+        return
+    max_bytes = getattr(settings, 'SEARCH_CACHE_MAX_ENTRY_BYTES', 256 * 1024)
+    if len(json.dumps(response, separators=(',', ':'))) <= max_bytes:
+        search_cache.set(key, response)
+
 
 class DoctorListView(View):
     template_name = 'doctor_list.html'
 
     def get(self, request):
         context = get_base_context(request)
+        params = self._search_params(request, context)
+        page, size = self._page_params(request)
+
+        try:
+            response = self._fetch_doctors(params, page, size, request.session.get("access_token"))
+            self._apply_response(context, response, params, page, size)
+        except Exception as e:
+            self._handle_error(request, context, e)
+        return self.render_page(request, context)
+
+    def render_page(self, request, context):
+        return cached_render(request, self.template_name, context)
+
+    def _handle_error(self, request, context, e):
+        messages.error(request, f"Error fetching doctors: {str(e)}")
+        context['fetch_error'] = str(e)
+
+    def _fetch_doctors(self, params, page, size, token):
+        key = search_cache_key({**params, 'page': page, 'size': size}, token)
+        response = search_cache.get(key, MISSING)
+        if response is MISSING:
+            response = api_request("GET", self._search_endpoint(params, page, size), token=token, coalesce=True)
+            cache_search_result(key, response)
+        return response
+
+    def _page_params(self, request):
+        """Read the 0-based page and page size, clamped to DOCTOR_PAGE_MAX_SIZE"""
+        default_size = getattr(settings, 'DOCTOR_PAGE_SIZE', 12)
+        max_size = getattr(settings, 'DOCTOR_PAGE_MAX_SIZE', 50)
+        try:
+            page = max(int(request.GET.get('page', 0)), 0)
+        except (TypeError, ValueError):
+            page = 0
+        try:
+            size = min(max(int(request.GET.get('size', default_size)), 1), max_size)
+        except (TypeError, ValueError):
+            size = default_size
+        return page, size
+
+    def _search_params(self, request, context):
         name = request.GET.get('name')
         speciality = request.GET.get('speciality')
         day = request.GET.get('day')
@@ -24,50 +111,119 @@ class DoctorListView(View):
             'end_time': end_time or ''
         })
 
+        params = {}
+        if name and name.strip():
+            params.update({
+                'name': name.strip(),
+            })
+        if speciality and speciality.strip():
+            params.update({
+                'speciality': speciality.strip(),
+            })
+        if day and start_time and end_time:
+            params.update({
+                'day': day.strip().upper(),
+                'startTime': start_time.strip(),
+                'endTime': end_time.strip()
+            })
+        return params
+
+    def _search_endpoint(self, params, page, size):
+        query = sorted({**params, 'page': page, 'size': size}.items())
+        if params:
+            # Use the new combined search endpoint
+            return "/api/doctors/search?" + urlencode(query)
+        # Get all doctors if no search parameters
+        return "/api/doctors?" + urlencode(query)
+
+    def _apply_response(self, context, response, params, page, size):
+        if response and 'doctorProfiles' in response:
+            doctors = response['doctorProfiles']
+            total_items = response.get('totalItems', len(doctors))
+            if len(doctors) > size:
+                # Backend ignored the page params; page locally so render cost stays bounded
+                total_items = len(doctors)
+                doctors = doctors[page * size:(page + 1) * size]
+            context.update({
+                'doctors': doctors,
+                'total_items': total_items,
+                'search_performed': bool(params)
+            })
+        else:
+            total_items = 0
+            context.update({
+                'doctors': [],
+                'total_items': 0,
+                'search_performed': bool(params),
+                'no_results': True
+            })
+
+        has_next = (page + 1) * size < total_items
+        context.update({
+            'page': page,
+            'page_size': size,
+            'has_next': has_next,
+            'next_page_query': urlencode({
+                **{key: context[key] for key in ('name', 'speciality', 'day', 'start_time', 'end_time') if context[key]},
+                'page': page + 1,
+                'size': size,
+            }) if has_next else '',
+        })
+
+class DoctorListFragmentMixin:
+    """Serve one page of doctor cards as JSON for incremental loading"""
+    fragment_template_name = 'doctor_cards.html'
+
+    def render_page(self, request, context):
+        if context.get('fetch_error'):
+            return JsonResponse({"error": f"Error fetching doctors: {context['fetch_error']}"}, status=502)
+
+        return JsonResponse({
+            'html': render_to_string(self.fragment_template_name, context, request=request),
+            'count': len(context.get('doctors', [])),
+            'page': context['page'],
+            'total_items': context.get('total_items', 0),
+            'has_next': context['has_next'],
+            'next_page_query': context['next_page_query'],
+        })
+
+    def _handle_error(self, request, context, e):
+        context['fetch_error'] = str(e)
+
+class DoctorListFragmentView(DoctorListFragmentMixin, DoctorListView):
+    pass
+
+class AsyncDoctorListView(DoctorListView):
+    """DoctorListView for ASGI deployments; awaits the search on the event loop"""
+
+    async def get(self, request):
+        session_data = await async_session_data(request)
+        context = {
+            'is_logged_in': bool(session_data['token']),
+            'user_role': session_data['user_role'] or 'guest',
+            'user_id': session_data['user_id']
+        }
+        params = self._search_params(request, context)
+        page, size = self._page_params(request)
+
         try:
-            params = {}
-            if name:
-                params.update({
-                    'name': name.strip(),
-                })
-            if speciality:
-                params.update({
-                    'speciality': speciality.strip(),
-                })
-            if day and start_time and end_time:
-                params.update({
-                    'day': day.strip().upper(),
-                    'startTime': start_time.strip(),
-                    'endTime': end_time.strip()
-                })
-
-            if params:
-                # Use the new combined search endpoint
-                endpoint = "/api/doctors/search?" + urlencode(params)
-                response = api_request("GET", endpoint, token=request.session.get("access_token"))
-            else:
-                # Get all doctors if no search parameters
-                response = api_request("GET", "/api/doctors", token=request.session.get("access_token"))
-            
-            if response and 'doctorProfiles' in response:
-                context.update({
-                    'doctors': response['doctorProfiles'],
-                    'total_items': response.get('totalItems', len(response['doctorProfiles'])),
-                    'search_performed': bool(params)
-                })
-            else:
-                context.update({
-                    'doctors': [],
-                    'total_items': 0,
-                    'search_performed': bool(params),
-                    'no_results': True
-                })
-            
-            return render(request, self.template_name, context)
-            
+            key = search_cache_key({**params, 'page': page, 'size': size}, session_data['token'])
+            response = search_cache.get(key, MISSING)
+            if response is MISSING:
+                response = await async_api_request(
+                    "GET",
+                    self._search_endpoint(params, page, size),
+                    token=session_data['token'],
+                    coalesce=True
+                )
+                cache_search_result(key, response)
+            self._apply_response(context, response, params, page, size)
         except Exception as e:
-            messages.error(request, f"Error fetching doctors: {str(e)}")
-            return render(request, self.template_name, context)
+            self._handle_error(request, context, e)
+        return await sync_to_async(self.render_page)(request, context)
+
+class AsyncDoctorListFragmentView(DoctorListFragmentMixin, AsyncDoctorListView):
+    pass
 
 class DoctorProfileView(View):
     template_name = 'doctor_profile.html'
@@ -79,9 +235,8 @@ class DoctorProfileView(View):
         try:
             uuid.UUID(str(doctor_id))
             
-            doctor_response = api_request(
-                "GET", 
-                f"/api/doctors/{doctor_id}", 
+            doctor_response = get_doctor_profile(
+                doctor_id,
                 token=request.session.get("access_token")
             )
 
@@ -93,7 +248,7 @@ class DoctorProfileView(View):
                 'patient_id': patient_id
             })
 
-            return render(request, self.template_name, context)
+            return cached_render(request, self.template_name, context)
             
         except ValueError as e:
             messages.error(request, f"Invalid ID format: {str(e)}")
@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class MainConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'main'
+
+    def ready(self):
+        from django.conf import settings
+        from .jwks import prefetch_jwks
+
+        if getattr(settings, 'JWKS_PREFETCH', False):
+            prefetch_jwks()
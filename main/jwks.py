@@ -0,0 +1,89 @@
+import threading
+import time
+
+import jwt
+from django.conf import settings
+
+from pandacare.api_client import get_session
+
+
+class JWKSCache:
+    """Process-wide cache of the auth server's signing keys"""
+
+    def __init__(self, url, ttl=600, min_refresh_interval=30, timeout=5):
+        self.url = url
+        self.ttl = ttl
+        self.min_refresh_interval = min_refresh_interval
+        self.timeout = timeout
+        self._keys = {}
+        self._fetched_at = 0
+        self._lock = threading.Lock()
+
+    def _is_fresh(self):
+        return bool(self._keys) and time.monotonic() - self._fetched_at < self.ttl
+
+    def refresh(self, force=False):
+        """Refetch the key set, at most once per min_refresh_interval when forced"""
+        with self._lock:
+            age = time.monotonic() - self._fetched_at
+            if not force and self._is_fresh():
+                return
+            if force and self._keys and age < self.min_refresh_interval:
+                return
+
+            response = get_session().get(self.url, timeout=self.timeout)
+            response.raise_for_status()
+            jwk_set = jwt.PyJWKSet.from_dict(response.json())
+            self._keys = {key.key_id: key for key in jwk_set.keys}
+            self._fetched_at = time.monotonic()
+
+    def prefetch(self):
+        try:
+            self.refresh()
+        except Exception:
+            pass
+
+    def get_signing_key(self, kid):
+        if not self._is_fresh():
+            self.refresh()
+
+        key = self._keys.get(kid)
+        if key is None:
+            # Unknown kid usually means the auth server rotated its keys
+            self.refresh(force=True)
+            key = self._keys.get(kid)
+        if key is None:
+            raise jwt.PyJWKClientError(f'Unable to find a signing key that matches: "{kid}"')
+        return key
+
+    def get_signing_key_from_jwt(self, token):
+        return self.get_signing_key(jwt.get_unverified_header(token).get("kid"))
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_jwks_cache():
+    """Return the shared JWKS cache, or None when JWKS_URL is not configured"""
+    global _cache
+
+    url = getattr(settings, "JWKS_URL", None)
+    if not url:
+        return None
+
+    if _cache is None or _cache.url != url:
+        with _cache_lock:
+            if _cache is None or _cache.url != url:
+                _cache = JWKSCache(url, ttl=getattr(settings, "JWKS_CACHE_TTL", 600))
+    return _cache
+
+
+def prefetch_jwks():
+    """Warm the key cache in the background so the first login stays local"""
+    cache = get_jwks_cache()
+    if cache is None:
+        return None
+    thread = threading.Thread(target=cache.prefetch, name="jwks-prefetch", daemon=True)
+    thread.start()
+    return thread
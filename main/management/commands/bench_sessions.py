@@ -0,0 +1,87 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from importlib import import_module
+
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+from django.test.utils import override_settings
+
+from pandacare.bench import SAMPLE_ID, summarize
+
+ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+    'cache': 'pandacare.sessions',
+}
+
+
+def login(store_class):
+    """Mirror LoginView.post: flush, clear, then write the auth keys"""
+    session = store_class()
+    session.flush()
+    session.clear()
+    session.update({
+        'access_token': 'bench-token',
+        'user_id': SAMPLE_ID,
+        'user_role': 'pacilian',
+    })
+    session.save()
+    return session.session_key
+
+
+def page_view(store_class, session_key):
+    """Mirror a logged-in page: load the session and read the auth keys"""
+    session = store_class(session_key)
+    return (session.get('access_token'), session.get('user_id'), session.get('user_role'))
+
+
+class Command(BaseCommand):
+    help = "Compare session engines under parallel page views and logins"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--engines', nargs='*', default=list(ENGINES), choices=list(ENGINES))
+        parser.add_argument('--workers', type=int, default=16)
+        parser.add_argument('--requests', type=int, default=200, help="Requests per worker")
+        parser.add_argument('--login-every', type=int, default=20, help="Every Nth request is a login")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'engine':16} {'req/s':>9} {'p50':>8} {'p95':>8} {'p99':>8} {'login p95':>10}")
+        for name in options['engines']:
+            if name == 'db' and 'django_session' not in connection.introspection.table_names():
+                self.stdout.write(f"{name:16} skipped: run 'manage.py migrate' to create the session table")
+                continue
+
+            with override_settings(SESSION_ENGINE=ENGINES[name]):
+                store_class = import_module(ENGINES[name]).SessionStore
+                views, logins, elapsed = self._run(store_class, options)
+
+            views_summary, logins_summary = summarize(views), summarize(logins)
+            total = len(views) + len(logins)
+            self.stdout.write(
+                f"{name:16} {total / elapsed:>9.0f} {views_summary['p50_ms']:>8.3f} "
+                f"{views_summary['p95_ms']:>8.3f} {views_summary['p99_ms']:>8.3f} {logins_summary['p95_ms']:>10.3f}"
+            )
+
+    def _run(self, store_class, options):
+        def worker(_):
+            views, logins = [], []
+            session_key = login(store_class)
+            for index in range(options['requests']):
+                started = time.perf_counter()
+                if index % options['login_every'] == 0:
+                    session_key = login(store_class)
+                    logins.append((time.perf_counter() - started) * 1000)
+                else:
+                    page_view(store_class, session_key)
+                    views.append((time.perf_counter() - started) * 1000)
+            connections.close_all()
+            return views, logins
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            results = list(executor.map(worker, range(options['workers'])))
+        elapsed = time.perf_counter() - started
+
+        views = [latency for worker_views, _ in results for latency in worker_views]
+        logins = [latency for _, worker_logins in results for latency in worker_logins]
+        return views, logins, elapsed
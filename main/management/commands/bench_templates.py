@@ -0,0 +1,78 @@
+import time
+
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.template.loader import render_to_string
+from django.test import RequestFactory
+from django.test.utils import override_settings
+
+from pandacare.bench import SAMPLE_ID, sample_doctor, sample_reservation, sample_schedule, summarize
+
+
+def list_contexts(rows):
+    """(template, context) pairs shaped like the list views build them"""
+    base = {'is_logged_in': True, 'user_id': SAMPLE_ID, 'caregiver_id': SAMPLE_ID}
+    return {
+        'doctor_list': ('doctor_list.html', {
+            **base, 'user_role': 'pacilian',
+            'doctors': [sample_doctor(i) for i in range(rows)], 'total_items': rows,
+        }),
+        'reservation_list': ('reservation_list.html', {
+            **base, 'user_role': 'caregiver',
+            'reservations': [sample_reservation(i, 'WAITING') for i in range(rows)],
+        }),
+        'schedule_list': ('schedule_list.html', {
+            **base, 'user_role': 'caregiver',
+            'schedules': [sample_schedule(i) for i in range(rows)], 'total_schedules': rows,
+        }),
+        'pacilian_list': ('list.html', {
+            **base, 'user_role': 'pacilian',
+            'reservasis': [sample_reservation(i) for i in range(rows)],
+        }),
+    }
+
+
+class Command(BaseCommand):
+    help = "Render the list templates with many rows, with and without fragment caching"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000)
+        parser.add_argument('--iterations', type=int, default=10)
+
+    def handle(self, *args, **options):
+        request = RequestFactory().get('/')
+        contexts = list_contexts(options['rows'])
+        no_fragments = {
+            'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+            'template_fragments': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+        }
+
+        self.stdout.write(f"{options['rows']} rows, {options['iterations']} iterations (p50 ms)")
+        self.stdout.write(f"{'template':20} {'uncached':>10} {'cold':>10} {'warm':>10} {'speedup':>8}")
+        for name, (template_name, context) in contexts.items():
+            def render():
+                return render_to_string(template_name, context, request)
+
+            with override_settings(CACHES=no_fragments):
+                uncached = self._time(render, options['iterations'])
+
+            cold = self._time(render, options['iterations'], before=caches['template_fragments'].clear)
+            warm = self._time(render, options['iterations'])
+
+            uncached_p50, cold_p50, warm_p50 = (summarize(samples)['p50_ms'] for samples in (uncached, cold, warm))
+            self.stdout.write(
+                f"{name:20} {uncached_p50:>10.1f} {cold_p50:>10.1f} {warm_p50:>10.1f} "
+                f"{uncached_p50 / warm_p50:>7.1f}x"
+            )
+
+    @staticmethod
+    def _time(render, iterations, before=None):
+        render()
+        samples = []
+        for _ in range(iterations):
+            if before:
+                before()
+            started = time.perf_counter()
+            render()
+            samples.append((time.perf_counter() - started) * 1000)
+        return samples
@@ -0,0 +1,169 @@
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+
+from pandacare.bench import SAMPLE_ID, StubBackend, compare, summarize
+from pandacare.cache import clear_caches as clear_named_caches
+
+# Session role used when requesting each namespace; everything else runs as a guest
+ROLE_BY_NAMESPACE = {
+    'schedule': 'caregiver',
+    'reservasi_caregiver': 'caregiver',
+    'reservasi_pacilian': 'pacilian',
+    'doctor_profile': 'pacilian',
+    'rating': 'pacilian',
+}
+ROLE_BY_NAME = {
+    'main:caregiver_dashboard': 'caregiver',
+    'main:pacilian_dashboard': 'pacilian',
+}
+SKIPPED_NAMESPACES = {'admin'}
+
+
+def iter_named_patterns(patterns=None, namespace=None):
+    """Yield (view name, URLPattern) for every named route in the root URLconf"""
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            child_namespace = pattern.namespace or namespace
+            if child_namespace in SKIPPED_NAMESPACES:
+                continue
+            yield from iter_named_patterns(pattern.url_patterns, child_namespace)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            name = f"{namespace}:{pattern.name}" if namespace else pattern.name
+            yield name, pattern
+
+
+def collect_targets():
+    """Resolve every named route to a concrete path using SAMPLE_ID for all arguments"""
+    targets = {}
+    seen_paths = set()
+    for name, pattern in iter_named_patterns():
+        kwargs = {key: SAMPLE_ID for key in pattern.pattern.converters}
+        path = reverse(name, kwargs=kwargs)
+        if path in seen_paths:
+            continue
+        seen_paths.add(path)
+
+        namespace = name.split(':', 1)[0] if ':' in name else None
+        role = ROLE_BY_NAME.get(name, ROLE_BY_NAMESPACE.get(namespace))
+        targets[name] = (path, role)
+    return targets
+
+
+def clear_caches():
+    """Empty every in-process cache a request can be served from: upstream data, validators and rendered fragments"""
+    clear_named_caches()
+    caches['template_fragments'].clear()
+
+
+class Command(BaseCommand):
+    help = "Benchmark every view against a simulated backend and optionally compare with a saved baseline"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=30)
+        parser.add_argument('--warmup', type=int, default=3)
+        parser.add_argument('--latency-ms', type=float, default=10.0, help="Simulated upstream latency per call")
+        parser.add_argument('--jitter-ms', type=float, default=0.0)
+        parser.add_argument('--rows', type=int, default=20, help="Items per upstream list response")
+        parser.add_argument('--only', nargs='*', help="Only benchmark these view names")
+        parser.add_argument('--cold', action='store_true', help="Clear in-process caches before every request")
+        parser.add_argument(
+            '--session-engine', default='django.contrib.sessions.backends.signed_cookies',
+            help="Signed cookies by default, so no session table or shared cache is needed",
+        )
+        parser.add_argument('--save', help="Write results as a JSON baseline to this path")
+        parser.add_argument('--compare', help="Compare results with the JSON baseline at this path")
+        parser.add_argument('--threshold', type=float, default=0.2, help="Relative slowdown treated as a regression")
+
+    def handle(self, *args, **options):
+        with StubBackend(options['latency_ms'], options['jitter_ms'], options['rows']) as backend:
+            with override_settings(
+                API_BASE_URL=backend.url,
+                ALLOWED_HOSTS=['*'],
+                SESSION_ENGINE=options['session_engine'],
+                JWKS_PREFETCH=False,
+            ):
+                results = self._run(backend, options)
+
+        self._report(results)
+
+        meta = {key: options[key] for key in ('iterations', 'latency_ms', 'jitter_ms', 'rows', 'cold')}
+        if options['save']:
+            with open(options['save'], 'w') as f:
+                json.dump({'meta': meta, 'views': results}, f, indent=2, sort_keys=True)
+            self.stdout.write(f"Baseline written to {options['save']}")
+
+        if options['compare']:
+            with open(options['compare']) as f:
+                baseline = json.load(f)
+            regressions = compare(baseline.get('views', {}), results, options['threshold'])
+            if regressions:
+                for line in regressions:
+                    self.stdout.write(self.style.ERROR(f"REGRESSION {line}"))
+                raise CommandError(f"{len(regressions)} regression(s) against {options['compare']}")
+            self.stdout.write(self.style.SUCCESS("No regressions against baseline"))
+
+    def _client(self, role):
+        from importlib import import_module
+
+        client = Client()
+        if role:
+            session = import_module(settings.SESSION_ENGINE).SessionStore()
+            session.update({'access_token': 'bench-token', 'user_id': SAMPLE_ID, 'user_role': role})
+            session.save()
+            client.cookies[settings.SESSION_COOKIE_NAME] = session.session_key
+        return client
+
+    def _run(self, backend, options):
+        targets = collect_targets()
+        if options['only']:
+            targets = {name: target for name, target in targets.items() if name in options['only']}
+
+        results = {}
+        for name, (path, role) in sorted(targets.items()):
+            for _ in range(options['warmup']):
+                self._client(role).get(path)
+
+            latencies, calls, sizes, status = [], 0, [], None
+            for _ in range(options['iterations']):
+                client = self._client(role)
+                if options['cold']:
+                    clear_caches()
+                backend.reset()
+
+                started = time.perf_counter()
+                response = client.get(path)
+                latencies.append((time.perf_counter() - started) * 1000)
+
+                calls += backend.call_count()
+                sizes.append(len(response.content))
+                status = response.status_code
+
+            results[name] = {
+                'path': path,
+                'role': role or 'guest',
+                'status': status,
+                'upstream_calls': round(calls / options['iterations'], 2),
+                'bytes': max(sizes),
+                **summarize(latencies),
+            }
+        return results
+
+    def _report(self, results):
+        header = f"{'view':46} {'status':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'calls':>6} {'bytes':>8}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for name, row in results.items():
+            self.stdout.write(
+                f"{name:46} {row['status']:>6} {row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} "
+                f"{row['p99_ms']:>8.1f} {row['upstream_calls']:>6} {row['bytes']:>8}"
+            )
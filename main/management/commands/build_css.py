@@ -0,0 +1,73 @@
+import json
+import shlex
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+BROWSER_CONFIG = Path('static/js/tailwind-config.js')
+
+INPUT_CSS = "@tailwind base;\n@tailwind components;\n@tailwind utilities;\n"
+
+# static/js/tailwind-config.js assigns the Play CDN's global `tailwind.config`;
+# evaluate it with a stand-in global and hand the result to the CLI.
+NODE_CONFIG = """globalThis.tailwind = {{}};
+require({browser_config});
+module.exports = {{ ...globalThis.tailwind.config, content: {content} }};
+"""
+
+
+def content_globs(base_dir):
+    """Every file that can carry class names: project and app templates plus static JS"""
+    base_dir = Path(base_dir)
+    return [
+        str(base_dir / 'templates' / '**' / '*.html'),
+        str(base_dir / '*' / 'templates' / '**' / '*.html'),
+        str(base_dir / 'static' / 'js' / '**' / '*.js'),
+    ]
+
+
+def tailwind_cli():
+    """TAILWIND_CLI if set, else the standalone binary on PATH, else Tailwind v3 through npx"""
+    if settings.TAILWIND_CLI:
+        return shlex.split(settings.TAILWIND_CLI)
+    if shutil.which('tailwindcss'):
+        return ['tailwindcss']
+    if shutil.which('npx'):
+        return ['npx', '--yes', 'tailwindcss@3']
+    raise CommandError("Tailwind CLI not found; install the standalone binary or set TAILWIND_CLI")
+
+
+class Command(BaseCommand):
+    help = "Build the purged, minified Tailwind stylesheet into static/ (run before collectstatic)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--no-minify', action='store_true', help="Keep the output readable")
+
+    def handle(self, *args, **options):
+        base_dir = Path(settings.BASE_DIR)
+        output = base_dir / 'static' / settings.TAILWIND_OUTPUT
+        output.parent.mkdir(parents=True, exist_ok=True)
+
+        with tempfile.TemporaryDirectory() as workdir:
+            config = Path(workdir) / 'tailwind.config.js'
+            config.write_text(NODE_CONFIG.format(
+                browser_config=json.dumps(str(base_dir / BROWSER_CONFIG)),
+                content=json.dumps(content_globs(base_dir)),
+            ))
+            source = Path(workdir) / 'input.css'
+            source.write_text(INPUT_CSS)
+
+            command = tailwind_cli() + ['--config', str(config), '--input', str(source), '--output', str(output)]
+            if not options['no_minify']:
+                command.append('--minify')
+
+            result = subprocess.run(command, cwd=base_dir, capture_output=True, text=True)
+            if result.returncode != 0:
+                raise CommandError(f"Tailwind build failed:\n{result.stderr.strip()}")
+
+        size_kb = output.stat().st_size / 1024
+        self.stdout.write(self.style.SUCCESS(f"Wrote {output.relative_to(base_dir)} ({size_kb:.1f} KB)"))
@@ -0,0 +1,132 @@
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from importlib import import_module
+
+import requests
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from pandacare.bench import SAMPLE_ID, StubBackend, summarize
+
+SIGNED_COOKIES = 'django.contrib.sessions.backends.signed_cookies'
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def session_cookie(role):
+    """A signed-cookie session the gunicorn workers can read without shared storage"""
+    session = import_module(SIGNED_COOKIES).SessionStore()
+    session.update({'access_token': 'bench-token', 'user_id': SAMPLE_ID, 'user_role': role})
+    session.save()
+    return session.session_key
+
+
+class Command(BaseCommand):
+    help = "Load-test gunicorn worker configurations (pandacare/gunicorn_conf.py) against a simulated backend"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--configs', nargs='*', default=['sync', 'gthread', 'uvicorn'])
+        parser.add_argument('--concurrency', type=int, nargs='*', default=[8, 32, 64])
+        parser.add_argument('--duration', type=float, default=10.0, help="Seconds per concurrency level")
+        parser.add_argument('--latency-ms', type=float, default=50.0, help="Simulated upstream latency per call")
+        parser.add_argument('--rows', type=int, default=20)
+        parser.add_argument('--path', help="Defaults to the caregiver reservation list")
+        parser.add_argument('--role', default='caregiver')
+        parser.add_argument('--workers', type=int, help="WEB_CONCURRENCY for every config")
+
+    def handle(self, *args, **options):
+        path = options['path'] or reverse('reservasi_caregiver:reservation_list', kwargs={'caregiver_id': SAMPLE_ID})
+        cookies = {settings.SESSION_COOKIE_NAME: session_cookie(options['role'])} if options['role'] else {}
+
+        self.stdout.write(f"{path} with {options['latency_ms']:.0f} ms upstream latency, {options['duration']:.0f}s per level")
+        self.stdout.write(f"{'config':10} {'conc':>5} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'errors':>7}")
+        with StubBackend(options['latency_ms'], rows=options['rows']) as backend:
+            for config in options['configs']:
+                port = free_port()
+                server = self._start_server(config, port, backend.url, options['workers'])
+                try:
+                    base_url = f"http://127.0.0.1:{port}"
+                    self._wait_ready(server, base_url + path, cookies)
+                    for concurrency in options['concurrency']:
+                        self._report(config, concurrency, self._load(base_url + path, cookies, concurrency, options['duration']))
+                finally:
+                    server.terminate()
+                    server.wait(timeout=30)
+
+    def _start_server(self, config, port, api_url, workers):
+        env = {
+            **os.environ,
+            'GUNICORN_WORKER_CLASS': config,
+            'GUNICORN_BIND': f"127.0.0.1:{port}",
+            'GUNICORN_LOG_LEVEL': 'warning',
+            'API_BASE_URL': api_url,
+            'SESSION_BACKEND': 'signed_cookies',
+            'JWKS_PREFETCH': 'false',
+            'LOG_LEVEL': 'WARNING',
+        }
+        if workers:
+            env['WEB_CONCURRENCY'] = str(workers)
+        return subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', '--config', 'python:pandacare.gunicorn_conf'],
+            cwd=settings.BASE_DIR, env=env,
+        )
+
+    @staticmethod
+    def _wait_ready(server, url, cookies, timeout=30):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise CommandError(f"gunicorn exited with status {server.returncode}")
+            try:
+                requests.get(url, cookies=cookies, timeout=5)
+                return
+            except requests.ConnectionError:
+                time.sleep(0.2)
+        raise CommandError(f"gunicorn did not answer {url} within {timeout}s")
+
+    @staticmethod
+    def _load(url, cookies, concurrency, duration):
+        latencies, errors = [], []
+        lock = threading.Lock()
+        stop_at = time.monotonic() + duration
+
+        def client():
+            session = requests.Session()
+            session.cookies.update(cookies)
+            own_latencies, own_errors = [], 0
+            while time.monotonic() < stop_at:
+                started = time.perf_counter()
+                try:
+                    response = session.get(url, timeout=30)
+                    if response.status_code != 200:
+                        own_errors += 1
+                except requests.RequestException:
+                    own_errors += 1
+                own_latencies.append((time.perf_counter() - started) * 1000)
+            with lock:
+                latencies.extend(own_latencies)
+                errors.append(own_errors)
+
+        started = time.monotonic()
+        threads = [threading.Thread(target=client) for _ in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+        return {'rps': len(latencies) / elapsed, 'errors': sum(errors), **summarize(latencies)}
+
+    def _report(self, config, concurrency, result):
+        self.stdout.write(
+            f"{config:10} {concurrency:>5} {result['rps']:>8.1f} {result['p50_ms']:>8.1f} "
+            f"{result['p95_ms']:>8.1f} {result['p99_ms']:>8.1f} {result['errors']:>7}"
+        )
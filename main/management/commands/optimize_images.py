@@ -0,0 +1,80 @@
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from pandacare.images import MANIFEST_NAME, OPTIMIZED_DIR, variant_name
+
+try:
+    from PIL import Image, features
+except ImportError:  # Pillow is only needed at build time
+    Image = features = None
+
+
+class Command(BaseCommand):
+    help = "Write resized WebP/AVIF variants of static raster images and their manifest (run before collectstatic)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--widths', type=int, nargs='*', default=settings.IMAGE_WIDTHS)
+        parser.add_argument('--formats', nargs='*', default=list(settings.IMAGE_QUALITY), choices=list(settings.IMAGE_QUALITY))
+        parser.add_argument('--force', action='store_true', help="Re-encode variants that are newer than their source")
+
+    def handle(self, *args, **options):
+        if Image is None:
+            raise CommandError("Pillow is required: pip install Pillow")
+
+        formats = [fmt for fmt in options['formats'] if features.check(fmt)]
+        for fmt in set(options['formats']) - set(formats):
+            self.stderr.write(f"Skipping {fmt}: not supported by this Pillow build")
+
+        static_dir = Path(settings.BASE_DIR) / 'static'
+        manifest = {}
+        for source_path in self._sources(static_dir):
+            source = source_path.relative_to(static_dir).as_posix()
+            with Image.open(source_path) as image:
+                image.load()
+                entry = {'width': image.width, 'height': image.height, 'variants': {}}
+                for fmt in formats:
+                    entry['variants'][fmt] = [
+                        self._write_variant(image, source_path, static_dir, source, width, fmt, options['force'])
+                        for width in self._widths(image.width, options['widths'])
+                    ]
+            manifest[source] = entry
+            self._report(static_dir, source_path, entry)
+
+        manifest_path = static_dir / MANIFEST_NAME
+        manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+        self.stdout.write(self.style.SUCCESS(f"Wrote {manifest_path.relative_to(static_dir)} ({len(manifest)} images)"))
+
+    @staticmethod
+    def _sources(static_dir):
+        optimized = static_dir / OPTIMIZED_DIR
+        for pattern in settings.IMAGE_SOURCES:
+            for path in sorted(static_dir.glob(pattern)):
+                if optimized not in path.parents:
+                    yield path
+
+    @staticmethod
+    def _widths(original, widths):
+        """Requested widths narrower than the original, plus the original width itself"""
+        return sorted({width for width in widths if width < original} | {original})
+
+    def _write_variant(self, image, source_path, static_dir, source, width, fmt, force):
+        name = variant_name(source, width, fmt)
+        target = static_dir / name
+        if force or not target.exists() or target.stat().st_mtime < source_path.stat().st_mtime:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            height = round(image.height * width / image.width)
+            resized = image if width == image.width else image.resize((width, height), resample=Image.Resampling.LANCZOS)
+            resized.save(target, format=fmt.upper(), quality=settings.IMAGE_QUALITY[fmt])
+        return {'width': width, 'path': name}
+
+    def _report(self, static_dir, source_path, entry):
+        original_kb = source_path.stat().st_size / 1024
+        sizes = ', '.join(
+            f"{fmt} {min((static_dir / v['path']).stat().st_size for v in variants) / 1024:.1f}-"
+            f"{max((static_dir / v['path']).stat().st_size for v in variants) / 1024:.1f} KB"
+            for fmt, variants in entry['variants'].items()
+        )
+        self.stdout.write(f"{source_path.relative_to(static_dir)} ({original_kb:.1f} KB): {sizes}")
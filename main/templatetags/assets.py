@@ -0,0 +1,50 @@
+from django import template
+from django.conf import settings
+from django.forms.utils import flatatt
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+
+from pandacare.images import MIME_TYPES, image_entry
+
+register = template.Library()
+
+
+@register.simple_tag
+def tailwind_css():
+    """The prebuilt Tailwind stylesheet, or the CDN runtime compiler when TAILWIND_CDN is on"""
+    if getattr(settings, 'TAILWIND_CDN', False):
+        return format_html(
+            '<script src="https://cdn.tailwindcss.com"></script>\n    <script src="{}"></script>',
+            static('js/tailwind-config.js'),
+        )
+    return format_html('<link rel="stylesheet" href="{}" />', static(settings.TAILWIND_OUTPUT))
+
+
+@register.simple_tag
+def responsive_image(source, alt='', sizes='100vw', loading='lazy', **attrs):
+    """<picture> with AVIF/WebP srcsets from the optimize_images manifest, falling back to the original file"""
+    entry = image_entry(source)
+    img_attrs = {'alt': alt, 'loading': loading, 'decoding': 'async', **attrs}
+    if not entry:
+        return format_html('<img src="{}"{} />', static(source), flatatt(img_attrs))
+
+    sources = format_html_join(
+        '', '<source type="{}" srcset="{}" sizes="{}" />',
+        (
+            (mime_type, ', '.join(f"{static(v['path'])} {v['width']}w" for v in entry['variants'][fmt]), sizes)
+            for fmt, mime_type in MIME_TYPES.items() if entry['variants'].get(fmt)
+        ),
+    )
+    img_attrs = {'width': entry['width'], 'height': entry['height'], **img_attrs}
+    return format_html('<picture>{}<img src="{}"{} /></picture>', sources, static(source), flatatt(img_attrs))
+
+
+@register.simple_tag
+def image_variant(source, width, fmt='webp'):
+    """URL of the narrowest variant at least ``width`` pixels wide, or of the original file"""
+    entry = image_entry(source)
+    variants = entry['variants'].get(fmt) if entry else None
+    if not variants:
+        return static(source)
+    wide_enough = [v for v in variants if v['width'] >= width] or variants[-1:]
+    return static(min(wide_enough, key=lambda v: v['width'])['path'])
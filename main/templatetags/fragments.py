@@ -0,0 +1,29 @@
+from django import template
+
+register = template.Library()
+
+
+@register.filter
+def fragment_version(item):
+    """Version key for a cached fragment: the record's own version or updatedAt, else ''.
+
+    Templates list the fields a row renders that can change in place next to
+    it, so the key never needs a digest of the whole record.
+    """
+    if not isinstance(item, dict):
+        return item
+    for field in ('version', 'updatedAt'):
+        if item.get(field) is not None:
+            return item[field]
+    return ''
+
+
+@register.filter
+def schedule_key(schedules, limit=3):
+    """Day and times of the first ``limit`` schedules, for keying fragments that render them"""
+    if not isinstance(schedules, (list, tuple)):
+        return ''
+    return '|'.join(
+        f"{s.get('day')} {s.get('startTime')}-{s.get('endTime')}" if isinstance(s, dict) else str(s)
+        for s in schedules[:int(limit)]
+    )
@@ -1,8 +1,10 @@
+from django.conf import settings
 from django.urls import path
 from .views import (
     HomePageView, 
     PacilianDashboardView, 
     CaregiverDashboardView, 
+    AsyncCaregiverDashboardView,
     LoginView, 
     RegisterView, 
     LogoutView
@@ -10,10 +12,12 @@ from .views import (
 
 app_name = 'main'
 
+DashboardView = AsyncCaregiverDashboardView if settings.ASYNC_VIEWS else CaregiverDashboardView
+
 urlpatterns = [
     path('', HomePageView.as_view(), name='home'),
     path('pacilian/dashboard/', PacilianDashboardView.as_view(), name='pacilian_dashboard'),
-    path('caregiver/dashboard/<str:caregiver_id>/', CaregiverDashboardView.as_view(), name='caregiver_dashboard'),
+    path('caregiver/dashboard/<str:caregiver_id>/', DashboardView.as_view(), name='caregiver_dashboard'),
     path('register/', RegisterView.as_view(), name='register'), 
     path('login/', LoginView.as_view(), name='login'),
     path('logout/', LogoutView.as_view(), name='logout'),
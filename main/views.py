@@ -6,55 +6,22 @@ from django.utils.decorators import method_decorator
 import requests
 from datetime import datetime
 import jwt
-from jwt import PyJWKClient
+import asyncio
 import base64
 import json
 import os
+from asgiref.sync import sync_to_async
+from pandacare.api_client import APIError, api_request
+from pandacare.async_api_client import async_api_request, async_session_data
+from pandacare.fanout import fan_out
+from pandacare.profiles import aget_caregiver_profile, get_caregiver_profile, invalidate_profile, is_client_error
+from .jwks import get_jwks_cache
 
 API_BASE_URL = os.getenv("API_BASE_URL")
-JWKS_URL = os.getenv("JWKS_URL")
 
 def is_logged_in(request):
     return bool(request.session.get("access_token"))
 
-def api_request(method, endpoint, data=None, token=None, params=None):
-    if not API_BASE_URL:
-        raise Exception("API_BASE_URL environment variable not set")
-
-    url = f"{API_BASE_URL}{endpoint}"
-    headers = {"Content-Type": "application/json"}
-    if token:
-        headers["Authorization"] = f"Bearer {token}"
-
-    try:
-        if method.upper() == "GET" and params:
-            response = requests.request(method, url, headers=headers, params=params, timeout=30)
-        elif data is not None:
-            response = requests.request(method, url, headers=headers, json=data, timeout=30)
-        else:
-            response = requests.request(method, url, headers=headers, timeout=30)
-
-        if response.status_code in [200, 201, 204]:
-            try:
-                return response.json()
-            except json.JSONDecodeError:
-                return response.text if response.text else {"success": True}
-        elif response.status_code in [401, 403]:
-            raise PermissionError(f"Unauthorized: {response.text}")
-        else:
-            raise Exception(f"API error {response.status_code}: {response.text}")
-
-    except requests.exceptions.Timeout:
-        raise Exception("Request timeout - server may be down")
-    except requests.exceptions.ConnectionError:
-        raise Exception("Connection error - cannot reach server")
-    except requests.exceptions.RequestException as e:
-        raise Exception(f"Network Error: {str(e)}")
-    except PermissionError:
-        raise
-    except Exception as e:
-        raise Exception(f"API Error: {str(e)}")
-
 def get_base_context(request):
     return {
         'is_logged_in': is_logged_in(request),
@@ -84,9 +51,9 @@ def decode_jwt_with_jwks(token):
     manual_decoded = decode_jwt_manually(token)
 
     try:
-        if JWKS_URL:
-            jwk_client = PyJWKClient(JWKS_URL)
-            signing_key = jwk_client.get_signing_key_from_jwt(token)
+        jwks_cache = get_jwks_cache()
+        if jwks_cache:
+            signing_key = jwks_cache.get_signing_key_from_jwt(token)
             decoded = jwt.decode(token, signing_key.key, algorithms=["RS256"], issuer="Pandacare")
             if 'roles' in decoded and isinstance(decoded['roles'], list) and decoded['roles']:
                 decoded['role'] = decoded['roles'][0]
@@ -158,15 +125,24 @@ class CaregiverDashboardView(View):
         return is_logged_in(request) and request.session.get("user_role") == required_role
 
     def _build_context(self, user_id, token):
+        results = fan_out({
+            'profile': lambda: self._fetch_caregiver_profile(user_id, token),
+            'approved': lambda: self._get_reservations(user_id, "APPROVED", token),
+            'waiting': lambda: self._get_reservations(user_id, "WAITING", token),
+        })
+
+        return self._assemble_context(
+            user_id,
+            results['profile'].get(),
+            results['approved'].get([]),
+            results['waiting'].get([])
+        )
+
+    def _assemble_context(self, user_id, caregiver_data, approved_reservations, waiting_reservations):
         caregiver_name = f"Dr. {str(user_id)[:8]}"
-
-        caregiver_data = self._fetch_caregiver_profile(user_id, token)
         if caregiver_data and caregiver_data.get("name"):
             caregiver_name = f"Dr. {caregiver_data['name']}"
 
-        approved_reservations = self._get_reservations(user_id, "APPROVED", token)
-        waiting_reservations = self._get_reservations(user_id, "WAITING", token)
-
         today_schedule = self._filter_today_schedule(approved_reservations)
 
         return {
@@ -181,42 +157,33 @@ class CaregiverDashboardView(View):
         }
 
     def _fetch_caregiver_profile(self, user_id, token):
-        endpoints_to_try = [
-            f"/api/caregivers/{user_id}/profile",
-            f"/api/doctors/{user_id}",
-        ]
-
-        for endpoint in endpoints_to_try:
-            try:
-                profile_data = api_request("GET", endpoint, token=token)
-                if profile_data:
-                    return profile_data
-            except Exception:
-                continue
-
-        return None
+        try:
+            return get_caregiver_profile(user_id, token)
+        except Exception:
+            return None
 
     def _get_reservations(self, user_id, status, token):
         try:
             endpoint = f"/api/caregivers/{user_id}/reservations"
-            reservations = api_request("GET", endpoint, params={"status": status}, token=token)
-
-            if reservations is None:
-                return []
-
-            if isinstance(reservations, list):
-                return reservations
-            elif isinstance(reservations, dict):
-                if 'data' in reservations:
-                    return reservations['data'] if isinstance(reservations['data'], list) else []
-                elif 'reservations' in reservations:
-                    return reservations['reservations'] if isinstance(reservations['reservations'], list) else []
-
+            reservations = api_request("GET", endpoint, params={"status": status}, token=token, revalidate=True)
+            return self._extract_reservations(reservations)
+        except Exception:
             return []
 
-        except Exception:
+    def _extract_reservations(self, reservations):
+        if reservations is None:
             return []
 
+        if isinstance(reservations, list):
+            return reservations
+        elif isinstance(reservations, dict):
+            if 'data' in reservations:
+                return reservations['data'] if isinstance(reservations['data'], list) else []
+            elif 'reservations' in reservations:
+                return reservations['reservations'] if isinstance(reservations['reservations'], list) else []
+
+        return []
+
     def _filter_today_schedule(self, reservations):
         if not reservations:
             return []
@@ -253,6 +220,49 @@ class CaregiverDashboardView(View):
             'user_role': 'caregiver'
         }
 
+@method_decorator(csrf_exempt, name='dispatch')
+class AsyncCaregiverDashboardView(CaregiverDashboardView):
+    """CaregiverDashboardView for ASGI deployments; awaits upstream calls on the event loop"""
+
+    async def get(self, request, caregiver_id=None):
+        session_data = await async_session_data(request)
+        if not session_data['token'] or session_data['user_role'] != "caregiver":
+            return redirect("main:login")
+
+        user_id = session_data['user_id']
+        token = session_data['token']
+
+        try:
+            context = await self._abuild_context(user_id, token)
+            context['user_id'] = user_id
+        except Exception:
+            messages.error(request, "Error loading dashboard")
+            context = self._error_context(user_id)
+        return await sync_to_async(render)(request, self.template_name, context)
+
+    async def _abuild_context(self, user_id, token):
+        caregiver_data, approved_reservations, waiting_reservations = await asyncio.gather(
+            self._afetch_caregiver_profile(user_id, token),
+            self._aget_reservations(user_id, "APPROVED", token),
+            self._aget_reservations(user_id, "WAITING", token),
+        )
+        return self._assemble_context(user_id, caregiver_data, approved_reservations, waiting_reservations)
+
+    async def _afetch_caregiver_profile(self, user_id, token):
+        try:
+            return await aget_caregiver_profile(user_id, token)
+        except Exception:
+            return None
+
+    async def _aget_reservations(self, user_id, status, token):
+        try:
+            endpoint = f"/api/caregivers/{user_id}/reservations"
+            reservations = await async_api_request("GET", endpoint, params={"status": status}, token=token,
+                                                  revalidate=True)
+            return self._extract_reservations(reservations)
+        except Exception:
+            return []
+
 @method_decorator(csrf_exempt, name='dispatch')
 class LoginView(View):
     template_name = 'login.html'
@@ -300,6 +310,7 @@ class LoginView(View):
 
             request.session.update({
                 "access_token": access_token,
+                "refresh_token": response.get("refresh"),
                 "user_id": user_id,
                 "user_role": role
             })
@@ -383,8 +394,15 @@ class RegisterView(View):
                     profile_response = api_request("POST", endpoint, profile_payload, token=access_token)
                     profile_created = True
                     break
-                except Exception:
-                    continue
+                except APIError as e:
+                    # A failing backend won't do better on the next endpoint
+                    if not is_client_error(e):
+                        break
+
+            user_id = (decode_jwt_manually(access_token) or {}).get("user_id")
+            if profile_created and user_id:
+                # Drop anything cached for this id before its profile existed
+                invalidate_profile(user_id)
 
             messages.success(request, "Registration successful! You can now sign in with your account.")
             return redirect("main:login")
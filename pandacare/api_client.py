@@ -0,0 +1,192 @@
+import json
+import os
+import threading
+import time
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+from .cache import LRUCache
+from .circuit import guard, is_failure
+from .instrumentation import timed_call
+from .singleflight import SingleFlight, request_key
+
+
+class APIError(Exception):
+    """Error raised for failed calls to the Spring Boot API"""
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class APIPermissionError(APIError, PermissionError):
+    """401/403 from the Spring Boot API"""
+
+
+class CircuitOpenError(APIError):
+    """Call rejected without contacting the API because its endpoint group is failing"""
+
+    def __init__(self, group, retry_after=None):
+        super().__init__(f"Service temporarily unavailable: {group} circuit is open", 503)
+        self.group = group
+        self.retry_after = retry_after
+
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+# Identical concurrent GETs (same endpoint, params and token) share one upstream call
+inflight = SingleFlight()
+
+# ETag/Last-Modified validators and parsed bodies of revalidated GETs, keyed like inflight
+conditional_cache = LRUCache(
+    maxsize=getattr(settings, "CONDITIONAL_CACHE_MAXSIZE", 1024),
+    ttl=getattr(settings, "CONDITIONAL_CACHE_TTL", 600),
+    name="conditional",
+)
+
+
+def get_session():
+    """Return the per-process pooled session, rebuilding it after a fork"""
+    global _session, _session_pid
+
+    pid = os.getpid()
+    if _session is not None and _session_pid == pid:
+        return _session
+
+    with _session_lock:
+        if _session is None or _session_pid != pid:
+            pool_size = getattr(settings, "API_POOL_MAXSIZE", 32)
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update({
+                "Content-Type": "application/json",
+                "Connection": "keep-alive",
+            })
+            _session = session
+            _session_pid = pid
+    return _session
+
+
+def build_url(endpoint):
+    base_url = getattr(settings, "API_BASE_URL", None)
+    if not base_url:
+        raise APIError("API_BASE_URL environment variable not set")
+    return f"{base_url}{endpoint}"
+
+
+def build_headers(token=None):
+    headers = {}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    return headers
+
+
+def handle_response(response):
+    """Map an upstream response to parsed data or an APIError"""
+    if response.status_code in [200, 201, 204]:
+        if not response.text or response.text.strip() == "":
+            return None
+        try:
+            return response.json()
+        except json.JSONDecodeError:
+            return response.text
+    elif response.status_code in [401, 403]:
+        raise APIPermissionError(f"Unauthorized: {response.text}", response.status_code)
+    else:
+        raise APIError(f"API error {response.status_code}: {response.text}", response.status_code)
+
+
+def send(method, endpoint, data=None, token=None, params=None, timeout=None, headers=None):
+    """Send a request over the shared session and return the raw response"""
+    request_headers = build_headers(token)
+    if headers:
+        request_headers.update(headers)
+
+    kwargs = {
+        "headers": request_headers,
+        "timeout": timeout or getattr(settings, "API_TIMEOUT", 30),
+    }
+    if params:
+        kwargs["params"] = params
+    if data is not None:
+        kwargs["json"] = data
+
+    url = build_url(endpoint)
+    permit = guard(endpoint)
+    started = time.perf_counter()
+    status_code = None
+    try:
+        response = timed_call(method, endpoint, lambda: get_session().request(method, url, **kwargs))
+        status_code = response.status_code
+        return response
+    except requests.exceptions.Timeout:
+        raise APIError("Request timeout - server may be down")
+    except requests.exceptions.ConnectionError:
+        raise APIError("Connection error - cannot reach server")
+    except requests.exceptions.RequestException as e:
+        raise APIError(f"Network Error: {str(e)}")
+    finally:
+        if permit:
+            permit.record(is_failure(status_code), (time.perf_counter() - started) * 1000)
+
+
+def validator_headers(entry):
+    """Conditional request headers for a cached conditional_cache entry"""
+    headers = {}
+    if entry is not None:
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+def remember_validators(key, response, body):
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if etag or last_modified:
+        conditional_cache.set(key, {"etag": etag, "last_modified": last_modified, "body": body})
+    else:
+        conditional_cache.delete(key)
+
+
+def conditional_get(endpoint, token=None, params=None, timeout=None):
+    """GET with If-None-Match/If-Modified-Since; a 304 returns the previously parsed body"""
+    key = request_key("GET", endpoint, params, token)
+    entry = conditional_cache.get(key)
+    response = send("GET", endpoint, token=token, params=params, timeout=timeout,
+                    headers=validator_headers(entry))
+    if response.status_code == 304 and entry is not None:
+        return entry["body"]
+
+    body = handle_response(response)
+    remember_validators(key, response, body)
+    return body
+
+
+def api_request(method, endpoint, data=None, token=None, params=None, timeout=None, coalesce=False,
+                revalidate=False):
+    """Call the Spring Boot API and return the parsed JSON body.
+
+    With ``coalesce=True`` a GET joins an identical in-flight call instead of
+    issuing its own. With ``revalidate=True`` a GET is sent conditionally and
+    an unchanged resource is served from the body parsed last time. In both
+    cases callers may share the same parsed object and must not mutate it.
+    """
+    is_get = method.upper() == "GET"
+    if coalesce and is_get:
+        return inflight.do(
+            request_key(method, endpoint, params, token),
+            lambda: api_request(method, endpoint, token=token, params=params, timeout=timeout, revalidate=revalidate),
+        )
+    if revalidate and is_get:
+        return conditional_get(endpoint, token=token, params=params, timeout=timeout)
+
+    response = send(method, endpoint, data=data, token=token, params=params, timeout=timeout)
+    return handle_response(response)
@@ -0,0 +1,132 @@
+import asyncio
+import time
+import weakref
+
+import httpx
+from django.conf import settings
+
+from .api_client import (
+    APIError,
+    build_headers,
+    build_url,
+    conditional_cache,
+    handle_response,
+    remember_validators,
+    validator_headers,
+)
+from .circuit import guard, is_failure
+from .instrumentation import atimed_call
+from .singleflight import AsyncSingleFlight, request_key, with_coalesce_rate
+
+_clients = weakref.WeakKeyDictionary()
+_inflight = weakref.WeakKeyDictionary()
+
+
+def get_async_client():
+    """Return the pooled httpx.AsyncClient bound to the running event loop"""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        pool_size = getattr(settings, "API_POOL_MAXSIZE", 32)
+        client = httpx.AsyncClient(
+            headers={"Content-Type": "application/json"},
+            limits=httpx.Limits(
+                max_connections=getattr(settings, "API_ASYNC_MAX_CONNECTIONS", pool_size * 10),
+                max_keepalive_connections=pool_size,
+            ),
+        )
+        _clients[loop] = client
+    return client
+
+
+async def async_send(method, endpoint, data=None, token=None, params=None, timeout=None, headers=None):
+    """Async counterpart of api_client.send"""
+    request_headers = build_headers(token)
+    if headers:
+        request_headers.update(headers)
+
+    kwargs = {
+        "headers": request_headers,
+        "timeout": timeout or getattr(settings, "API_TIMEOUT", 30),
+    }
+    if params:
+        kwargs["params"] = params
+    if data is not None:
+        kwargs["json"] = data
+
+    url = build_url(endpoint)
+    permit = guard(endpoint)
+    started = time.perf_counter()
+    status_code = None
+    try:
+        response = await atimed_call(method, endpoint, lambda: get_async_client().request(method, url, **kwargs))
+        status_code = response.status_code
+        return response
+    except httpx.TimeoutException:
+        raise APIError("Request timeout - server may be down")
+    except httpx.ConnectError:
+        raise APIError("Connection error - cannot reach server")
+    except httpx.HTTPError as e:
+        raise APIError(f"Network Error: {str(e)}")
+    finally:
+        if permit:
+            permit.record(is_failure(status_code), (time.perf_counter() - started) * 1000)
+
+
+def get_async_inflight():
+    """Return the single-flight registry for the running event loop"""
+    loop = asyncio.get_running_loop()
+    inflight = _inflight.get(loop)
+    if inflight is None:
+        inflight = _inflight[loop] = AsyncSingleFlight()
+    return inflight
+
+
+def async_inflight_stats():
+    """SingleFlight stats summed over every event loop in this process"""
+    totals = {'executed': 0, 'coalesced': 0, 'in_flight': 0}
+    for inflight in list(_inflight.values()):
+        for name, value in inflight.stats().items():
+            if name in totals:
+                totals[name] += value
+    return with_coalesce_rate(totals)
+
+
+async def async_conditional_get(endpoint, token=None, params=None, timeout=None):
+    """Async counterpart of api_client.conditional_get"""
+    key = request_key("GET", endpoint, params, token)
+    entry = conditional_cache.get(key)
+    response = await async_send("GET", endpoint, token=token, params=params, timeout=timeout,
+                                headers=validator_headers(entry))
+    if response.status_code == 304 and entry is not None:
+        return entry["body"]
+
+    body = handle_response(response)
+    remember_validators(key, response, body)
+    return body
+
+
+async def async_api_request(method, endpoint, data=None, token=None, params=None, timeout=None, coalesce=False,
+                            revalidate=False):
+    """Async counterpart of api_client.api_request"""
+    is_get = method.upper() == "GET"
+    if coalesce and is_get:
+        return await get_async_inflight().do(
+            request_key(method, endpoint, params, token),
+            lambda: async_api_request(method, endpoint, token=token, params=params, timeout=timeout,
+                                      revalidate=revalidate),
+        )
+    if revalidate and is_get:
+        return await async_conditional_get(endpoint, token=token, params=params, timeout=timeout)
+
+    response = await async_send(method, endpoint, data=data, token=token, params=params, timeout=timeout)
+    return handle_response(response)
+
+
+async def async_session_data(request):
+    """Read the auth keys from the session without blocking the event loop"""
+    return {
+        'token': await request.session.aget("access_token"),
+        'user_id': await request.session.aget("user_id"),
+        'user_role': await request.session.aget("user_role"),
+    }
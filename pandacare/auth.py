@@ -0,0 +1,144 @@
+import base64
+import hashlib
+import json
+import time
+from functools import lru_cache
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib import messages
+from django.http import JsonResponse
+from django.shortcuts import redirect
+from django.urls import reverse
+
+from .api_client import APIError, APIPermissionError, api_request
+from .cache import LRUCache
+from .singleflight import SingleFlight
+
+REFRESH_ENDPOINT = "/api/auth/token/refresh"
+
+# Concurrent refreshes of the same session share one upstream call
+refresh_flight = SingleFlight()
+
+# Tokens issued for a refresh token in the last few seconds, for requests that
+# loaded the session before the refreshing request saved it
+recent_refreshes = LRUCache(maxsize=1024, ttl=30)
+
+
+class SessionExpired(APIPermissionError):
+    """The stored access token has expired and could not be refreshed"""
+
+    def __init__(self, message="Unauthorized: session expired"):
+        super().__init__(message, 401)
+
+
+@lru_cache(maxsize=2048)
+def token_expiry(token):
+    """Read the ``exp`` claim from a JWT without verifying it; None if absent or malformed"""
+    try:
+        payload_b64 = token.split('.')[1]
+        payload_b64 += '=' * (-len(payload_b64) % 4)
+        exp = json.loads(base64.urlsafe_b64decode(payload_b64)).get('exp')
+        return float(exp) if exp is not None else None
+    except (IndexError, ValueError, TypeError, AttributeError):
+        return None
+
+
+def seconds_left(token):
+    exp = token_expiry(token)
+    return None if exp is None else exp - time.time()
+
+
+def refresh_tokens(refresh_token):
+    """Exchange a refresh token for a new (access, refresh) pair, once per process at a time"""
+    key = hashlib.sha256(refresh_token.encode()).hexdigest()
+
+    def load():
+        response = api_request("POST", REFRESH_ENDPOINT, {"refresh_token": refresh_token})
+        if not isinstance(response, dict) or not response.get("access"):
+            raise APIError("Token refresh returned no access token")
+        return response["access"], response.get("refresh") or refresh_token
+
+    return recent_refreshes.get_or_set(key, lambda: refresh_flight.do(key, load))
+
+
+def saved_tokens(session):
+    """(access, refresh) as last saved for this session, possibly by another worker"""
+    if not session.session_key:
+        return None, None
+    stored = session.__class__(session.session_key)
+    if hasattr(stored, "forget_local"):
+        stored.forget_local()
+    return stored.get("access_token"), stored.get("refresh_token")
+
+
+def refresh_session(request, force=False):
+    """Return a usable access token for the session, refreshing it shortly before expiry.
+
+    If the refresh fails because another worker already rotated the refresh
+    token, the tokens it saved are adopted instead. Raises SessionExpired
+    when the token has already expired and cannot be refreshed, without
+    calling the API.
+    """
+    token = request.session.get("access_token")
+    if not token:
+        return None
+
+    remaining = seconds_left(token)
+    margin = getattr(settings, "TOKEN_REFRESH_MARGIN", 60)
+    if not force and (remaining is None or remaining > margin):
+        return token
+
+    refresh_token = request.session.get("refresh_token")
+    if refresh_token:
+        try:
+            access, refresh = refresh_tokens(refresh_token)
+            request.session["access_token"] = access
+            request.session["refresh_token"] = refresh
+            return access
+        except APIError:
+            access, refresh = saved_tokens(request.session)
+            left = seconds_left(access) if access else None
+            if access and access != token and (left is None or left > 0):
+                request.session["access_token"] = access
+                request.session["refresh_token"] = refresh or refresh_token
+                return access
+
+    if force or (remaining is not None and remaining <= 0):
+        raise SessionExpired()
+    return token
+
+
+def session_expired_response(request):
+    request.session.flush()
+    if request.headers.get("Accept", "").startswith("application/json") or request.content_type == "application/json":
+        return JsonResponse({"error": "Session expired", "redirect": reverse("main:login")}, status=401)
+    messages.error(request, "Session expired. Please login again.")
+    return redirect("main:login")
+
+
+class TokenRefreshMiddleware:
+    """Refresh the session's access token before views read it; log out expired sessions locally"""
+
+    sync_capable = True
+    async_capable = True
+
+    exempt_views = {"main:login", "main:logout", "main:register"}
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        match = request.resolver_match
+        if match and match.view_name in self.exempt_views:
+            return None
+        try:
+            refresh_session(request)
+        except SessionExpired:
+            return session_expired_response(request)
+        return None
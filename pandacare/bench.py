@@ -0,0 +1,210 @@
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+SAMPLE_ID = "11111111-1111-4111-8111-111111111111"
+DAYS = ['MONDAY', 'TUESDAY', 'WEDNESDAY', 'THURSDAY', 'FRIDAY', 'SATURDAY', 'SUNDAY']
+
+
+def _uuid(index):
+    return f"{index:08x}-2222-4222-8222-222222222222"
+
+
+def sample_schedule(index):
+    return {
+        'id': _uuid(index),
+        'caregiverId': SAMPLE_ID,
+        'date': '2025-06-02',
+        'day': DAYS[index % 7],
+        'startTime': f"{8 + index % 10:02d}:00",
+        'endTime': f"{9 + index % 10:02d}:00",
+        'status': 'AVAILABLE',
+    }
+
+
+def sample_reservation(index, status='APPROVED'):
+    return {
+        'id': SAMPLE_ID if index == 0 else _uuid(index),
+        'idPacilian': SAMPLE_ID,
+        'patientName': f"Pasien {index}",
+        'pacilianNote': "Keluhan demam dan batuk",
+        'statusReservasi': status,
+        'idSchedule': sample_schedule(index),
+    }
+
+
+def sample_doctor(index):
+    return {
+        'id': _uuid(index),
+        'caregiverId': SAMPLE_ID if index == 0 else _uuid(index),
+        'name': f"Dokter {index}",
+        'speciality': "Umum",
+        'workAddress': "Jl. Margonda Raya",
+        'averageRating': 4.5,
+        'totalRatings': 12,
+        'workSchedule': [sample_schedule(index + offset) for offset in range(3)],
+    }
+
+
+def default_routes(rows):
+    """Canned responses for every endpoint the front-end calls"""
+    doctors = {'doctorProfiles': [sample_doctor(i) for i in range(rows)], 'totalItems': rows}
+    return [
+        (r'^/api/doctors/search$', lambda m, q: doctors),
+        (r'^/api/doctors$', lambda m, q: doctors),
+        (r'^/api/doctors/[^/]+$', lambda m, q: sample_doctor(0)),
+        (r'^/api/caregivers/[^/]+/profile$', lambda m, q: {'name': "Dokter 0"}),
+        (r'^/api/caregivers/[^/]+/reservations$', lambda m, q: [
+            sample_reservation(i, q.get('status', 'WAITING')) for i in range(rows)
+        ]),
+        (r'^/api/caregivers/[^/]+/schedules', lambda m, q: {
+            'status': 200, 'data': [sample_schedule(i) for i in range(rows)]
+        }),
+        (r'^/api/caregivers/[^/]+$', lambda m, q: {'status': 200, 'data': {'name': "Dokter 0"}}),
+        (r'^/api/reservasi-konsultasi/[^/]+$', lambda m, q: [sample_reservation(i) for i in range(rows)]),
+        (r'^/api/async/consultations/[^/]+/rating/status$', lambda m, q: {'data': {'hasRated': True}}),
+        (r'^/api/async/consultations/[^/]+/ratings$', lambda m, q: {
+            'data': {'rating': {'ratingScore': 5, 'ulasan': "Sangat membantu"}}
+        }),
+    ]
+
+
+class StubBackend:
+    """Threaded HTTP server imitating the Spring Boot API with configurable latency"""
+
+    def __init__(self, latency_ms=0.0, jitter_ms=0.0, rows=20, routes=None, etags=True):
+        self.latency_ms = latency_ms
+        self.etags = etags
+        self.jitter_ms = jitter_ms
+        self.routes = [(re.compile(pattern), handler) for pattern, handler in (routes or default_routes(rows))]
+        self.calls = []
+        self._lock = threading.Lock()
+        self._server = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def reset(self):
+        with self._lock:
+            self.calls = []
+
+    def call_count(self):
+        with self._lock:
+            return len(self.calls)
+
+    def _respond(self, method, raw_path):
+        parts = urlsplit(raw_path)
+        query = dict(pair.split('=', 1) for pair in parts.query.split('&') if '=' in pair)
+        with self._lock:
+            self.calls.append((method, parts.path))
+
+        delay = self.latency_ms + random.uniform(0, self.jitter_ms)
+        if delay:
+            time.sleep(delay / 1000)
+
+        for pattern, handler in self.routes:
+            match = pattern.match(parts.path)
+            if match:
+                return 200, handler(match, query)
+        return 200, {}
+
+    def start(self):
+        backend = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes; with Nagle on, every
+            # keep-alive response would wait ~40 ms for the client's delayed ACK
+            disable_nagle_algorithm = True
+
+            def _handle(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                if length:
+                    self.rfile.read(length)
+                status, payload = backend._respond(self.command, self.path)
+                body = json.dumps(payload).encode()
+                headers = {"Content-Type": "application/json"}
+                if backend.etags and self.command == "GET":
+                    etag = f'"{hashlib.sha1(body).hexdigest()}"'
+                    headers["ETag"] = etag
+                    if self.headers.get("If-None-Match") == etag:
+                        status, body = 304, b""
+                headers["Content-Length"] = str(len(body))
+
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="stub-backend", daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def summarize(latencies_ms):
+    return {
+        'p50_ms': round(percentile(latencies_ms, 50), 3),
+        'p95_ms': round(percentile(latencies_ms, 95), 3),
+        'p99_ms': round(percentile(latencies_ms, 99), 3),
+        'mean_ms': round(sum(latencies_ms) / len(latencies_ms), 3) if latencies_ms else 0.0,
+    }
+
+
+def compare(baseline, current, threshold=0.2, min_delta_ms=2.0):
+    """Return human-readable regressions of ``current`` against ``baseline``"""
+    regressions = []
+    for name, now in current.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+
+        for metric in ('p50_ms', 'p95_ms', 'p99_ms'):
+            delta = now[metric] - before[metric]
+            if delta > min_delta_ms and delta > before[metric] * threshold:
+                regressions.append(f"{name}: {metric} {before[metric]:.1f} -> {now[metric]:.1f}")
+
+        if now['upstream_calls'] > before['upstream_calls']:
+            regressions.append(
+                f"{name}: upstream_calls {before['upstream_calls']} -> {now['upstream_calls']}"
+            )
+        if now['bytes'] > before['bytes'] * (1 + threshold):
+            regressions.append(f"{name}: bytes {before['bytes']} -> {now['bytes']}")
+        if now['status'] != before['status']:
+            regressions.append(f"{name}: status {before['status']} -> {now['status']}")
+    return regressions
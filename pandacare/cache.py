@@ -0,0 +1,124 @@
+import threading
+import time
+from collections import OrderedDict
+
+MISSING = object()
+
+# Caches created with a name, for metrics and benchmarks
+_named_caches = {}
+_named_caches_lock = threading.Lock()
+
+
+class LRUCache:
+    """Thread-safe in-process cache with size-based LRU eviction and a TTL"""
+
+    def __init__(self, maxsize=512, ttl=300, name=None):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        if name:
+            with _named_caches_lock:
+                _named_caches[name] = self
+
+    def get(self, key, default=None):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key, MISSING)
+            if entry is MISSING:
+                self.misses += 1
+                return default
+
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_set(self, key, loader, ttl=None):
+        """Return the cached value or call loader(); falsy results are not cached"""
+        value = self.get(key, MISSING)
+        if value is not MISSING:
+            return value
+
+        value = loader()
+        if value:
+            self.set(key, value, ttl)
+        return value
+
+    def update(self, key, func):
+        """Replace a live entry with func(value), keeping its expiry; None from func drops it.
+
+        Returns whether an updated entry is left in place.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key, MISSING)
+            if entry is MISSING or entry[0] <= now:
+                return False
+            value = func(entry[1])
+            if value is None:
+                del self._data[key]
+                return False
+            self._data[key] = (entry[0], value)
+            return True
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+def cache_stats():
+    """Stats of every named cache in this process, for metrics"""
+    with _named_caches_lock:
+        caches = list(_named_caches.values())
+    return {cache.name: cache.stats() for cache in caches}
+
+
+def clear_caches():
+    """Empty every named cache and reset its counters"""
+    with _named_caches_lock:
+        caches = list(_named_caches.values())
+    for cache in caches:
+        cache.clear()
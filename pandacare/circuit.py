@@ -0,0 +1,293 @@
+import contextvars
+import threading
+import time
+from collections import deque
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.shortcuts import render
+
+from .instrumentation import current_calls
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+# Endpoint groups rejected by an open circuit while handling the current request
+_rejected_groups = contextvars.ContextVar('rejected_groups', default=None)
+
+
+def endpoint_group(endpoint):
+    """Group endpoints by the first path segment after /api, e.g. /api/caregivers/x -> caregivers"""
+    segments = [segment for segment in endpoint.split('?', 1)[0].split('/') if segment]
+    if segments and segments[0] == 'api':
+        segments = segments[1:]
+    return segments[0] if segments else 'root'
+
+
+class Permit:
+    """An admitted call; report its outcome with record()"""
+
+    __slots__ = ('breaker', 'epoch', 'probe')
+
+    def __init__(self, breaker, epoch, probe):
+        self.breaker = breaker
+        self.epoch = epoch
+        self.probe = probe
+
+    def record(self, failed, duration_ms):
+        self.breaker.record(failed, duration_ms, permit=self)
+
+
+class CircuitBreaker:
+    """Rolling-window circuit breaker for one endpoint group.
+
+    Closed: calls pass through and outcomes are recorded. Once the window
+    holds ``min_calls`` outcomes and the failure or slow-call rate reaches its
+    threshold the circuit opens and calls fail immediately. After
+    ``open_seconds`` up to ``half_open_probes`` calls are let through; a
+    successful probe closes the circuit, a failed one opens it again. Every
+    state change starts a new epoch, and outcomes of calls admitted in an
+    earlier epoch are ignored, so only an admitted probe decides a half-open
+    circuit.
+    """
+
+    def __init__(self, name, window_seconds=30, min_calls=10, error_rate=0.5,
+                 slow_call_ms=5000, slow_rate=0.5, open_seconds=15, half_open_probes=1):
+        self.name = name
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.slow_call_ms = slow_call_ms
+        self.slow_rate = slow_rate
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+
+        self.state = CLOSED
+        self.opened_at = None
+        self.opens = 0
+        self.rejections = 0
+        self._probes = 0
+        self._epoch = 0
+        self._outcomes = deque()
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Return a Permit if a call may go upstream now, else None"""
+        with self._lock:
+            if self.state == OPEN:
+                if time.monotonic() - self.opened_at < self.open_seconds:
+                    self.rejections += 1
+                    return None
+                self._transition(HALF_OPEN)
+                self._probes = 0
+
+            if self.state == HALF_OPEN:
+                if self._probes >= self.half_open_probes:
+                    self.rejections += 1
+                    return None
+                self._probes += 1
+                return Permit(self, self._epoch, probe=True)
+            return Permit(self, self._epoch, probe=False)
+
+    def record(self, failed, duration_ms, permit=None):
+        """Record an outcome; with a permit, only if it was admitted in the current state"""
+        slow = duration_ms >= self.slow_call_ms
+        with self._lock:
+            if permit is not None and permit.epoch != self._epoch:
+                # Late result of a call admitted before the last state change
+                return
+            if self.state == HALF_OPEN:
+                if permit is not None and not permit.probe:
+                    return
+                if failed or slow:
+                    self._open()
+                else:
+                    self._transition(CLOSED)
+                    self._outcomes.clear()
+                return
+            if self.state == OPEN:
+                return
+
+            now = time.monotonic()
+            self._outcomes.append((now, failed, slow))
+            self._prune(now)
+            if self.state == CLOSED and self._tripped():
+                self._open()
+
+    def retry_after(self):
+        with self._lock:
+            if self.state != OPEN:
+                return 0
+            return max(int(self.open_seconds - (time.monotonic() - self.opened_at)) + 1, 1)
+
+    def _prune(self, now):
+        while self._outcomes and now - self._outcomes[0][0] > self.window_seconds:
+            self._outcomes.popleft()
+
+    def _tripped(self):
+        total = len(self._outcomes)
+        if total < self.min_calls:
+            return False
+        failures = sum(1 for _, failed, _ in self._outcomes if failed)
+        slow = sum(1 for _, _, is_slow in self._outcomes if is_slow)
+        return failures / total >= self.error_rate or slow / total >= self.slow_rate
+
+    def _transition(self, state):
+        self.state = state
+        self._epoch += 1
+
+    def _open(self):
+        self._transition(OPEN)
+        self.opened_at = time.monotonic()
+        self.opens += 1
+        self._outcomes.clear()
+
+    def stats(self):
+        with self._lock:
+            self._prune(time.monotonic())
+            return {
+                'state': self.state,
+                'window_calls': len(self._outcomes),
+                'window_failures': sum(1 for _, failed, _ in self._outcomes if failed),
+                'window_slow': sum(1 for _, _, slow in self._outcomes if slow),
+                'opens': self.opens,
+                'rejections': self.rejections,
+            }
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(group):
+    breaker = _breakers.get(group)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.get(group)
+            if breaker is None:
+                breaker = _breakers[group] = CircuitBreaker(
+                    group,
+                    window_seconds=getattr(settings, 'CIRCUIT_WINDOW_SECONDS', 30),
+                    min_calls=getattr(settings, 'CIRCUIT_MIN_CALLS', 10),
+                    error_rate=getattr(settings, 'CIRCUIT_ERROR_RATE', 0.5),
+                    slow_call_ms=getattr(settings, 'CIRCUIT_SLOW_CALL_MS', 5000),
+                    slow_rate=getattr(settings, 'CIRCUIT_SLOW_RATE', 0.5),
+                    open_seconds=getattr(settings, 'CIRCUIT_OPEN_SECONDS', 15),
+                    half_open_probes=getattr(settings, 'CIRCUIT_HALF_OPEN_PROBES', 1),
+                )
+    return breaker
+
+
+def breaker_states():
+    """Current state of every endpoint group's circuit, for metrics"""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.stats() for breaker in breakers}
+
+
+def reset_breakers():
+    with _breakers_lock:
+        _breakers.clear()
+
+
+def is_failure(status_code):
+    """Network errors (no status) and 5xx count against the circuit; 4xx are the caller's fault"""
+    return status_code is None or status_code >= 500
+
+
+def guard(endpoint):
+    """Return a Permit for a call to endpoint, raising CircuitOpenError if the circuit rejects it"""
+    from .api_client import CircuitOpenError
+
+    if not getattr(settings, 'CIRCUIT_BREAKER_ENABLED', True):
+        return None
+
+    group = endpoint_group(endpoint)
+    breaker = get_breaker(group)
+    permit = breaker.allow()
+    if permit is None:
+        rejected = _rejected_groups.get()
+        if rejected is not None:
+            rejected.append(group)
+        raise CircuitOpenError(group, breaker.retry_after())
+    return permit
+
+
+def rejected_groups():
+    return list(_rejected_groups.get() or [])
+
+
+def track_rejections():
+    """Start collecting rejected groups for the current request; returns a reset token"""
+    return _rejected_groups.set([])
+
+
+def stop_tracking(token):
+    _rejected_groups.reset(token)
+
+
+class CircuitBreakerMiddleware:
+    """Serve a friendly degraded page when a page could not load because circuits are open.
+
+    Applies to uncaught CircuitOpenError, and to GET pages whose upstream
+    calls were all rejected (views that swallow errors would otherwise
+    render an empty page).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+
+        token = track_rejections()
+        try:
+            response = self.get_response(request)
+            return self._check(request, response)
+        finally:
+            stop_tracking(token)
+
+    async def __acall__(self, request):
+        token = track_rejections()
+        try:
+            response = await self.get_response(request)
+            return await sync_to_async(self._check)(request, response)
+        finally:
+            stop_tracking(token)
+
+    def process_exception(self, request, exception):
+        from .api_client import CircuitOpenError
+
+        if isinstance(exception, CircuitOpenError):
+            return degraded_response(request, [exception.group])
+        return None
+
+    def _check(self, request, response):
+        groups = rejected_groups()
+        if not groups or request.method != 'GET' or response.status_code not in (200, 302):
+            return response
+        if response.status_code == 200 and 'text/html' not in response.get('Content-Type', ''):
+            return response
+        if any(200 <= call.status < 400 for call in current_calls()):
+            return response
+        return degraded_response(request, groups)
+
+
+def degraded_response(request, groups):
+    retry_after = max((get_breaker(group).retry_after() for group in groups), default=0) or 15
+    from main.views import get_base_context
+
+    context = get_base_context(request)
+    context['retry_after'] = retry_after
+    response = render(request, 'degraded.html', context, status=503)
+    response['Retry-After'] = str(retry_after)
+    response['Cache-Control'] = 'no-store'
+    return response
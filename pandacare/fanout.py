@@ -0,0 +1,134 @@
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from django.conf import settings
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+class CallResult:
+    """Outcome of one fanned-out call: either a value or the error it raised"""
+
+    __slots__ = ('value', 'error')
+
+    def __init__(self, value=None, error=None):
+        self.value = value
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def get(self, default=None):
+        return self.value if self.error is None else default
+
+    def unwrap(self):
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+def get_executor():
+    """Return the per-process pool shared by every fan-out, rebuilding it after a fork"""
+    global _executor, _executor_pid
+
+    pid = os.getpid()
+    if _executor is not None and _executor_pid == pid:
+        return _executor
+
+    with _executor_lock:
+        if _executor is None or _executor_pid != pid:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'FANOUT_MAX_WORKERS', 16),
+                thread_name_prefix='fanout',
+            )
+            _executor_pid = pid
+    return _executor
+
+
+def fan_out(calls, budget=None):
+    """Run independent zero-argument callables in parallel.
+
+    ``calls`` maps a name to a callable. Returns a dict mapping the same names
+    to CallResult. A call that raises, or has not finished once ``budget``
+    seconds have passed for the whole batch, gets its error recorded instead
+    of failing the others. Calls share one pool, so they must not fan out
+    themselves. Each call runs in a copy of the caller's context so
+    request-scoped state such as upstream timing follows it.
+    """
+    if budget is None:
+        budget = getattr(settings, 'FANOUT_BUDGET', 30)
+
+    executor = get_executor()
+    futures = {name: executor.submit(contextvars.copy_context().run, call) for name, call in calls.items()}
+    deadline = time.monotonic() + budget
+
+    results = {}
+    for name, future in futures.items():
+        try:
+            remaining = max(deadline - time.monotonic(), 0)
+            results[name] = CallResult(value=future.result(timeout=remaining))
+        except FutureTimeoutError:
+            future.cancel()
+            results[name] = CallResult(error=TimeoutError(f"'{name}' exceeded the {budget}s request budget"))
+        except Exception as e:
+            results[name] = CallResult(error=e)
+    return results
+
+
+def fan_out_map(func, items, budget=None, limit=None):
+    """Apply func to each item in parallel; returns CallResults in input order.
+
+    ``limit`` caps how many items are in flight at once, so a large batch
+    leaves room in the shared pool for other requests.
+    """
+    items = list(items)
+    if limit and limit < len(items):
+        return _bounded_map(func, items, budget, limit)
+    results = fan_out({index: (lambda item=item: func(item)) for index, item in enumerate(items)}, budget)
+    return [results[index] for index in range(len(items))]
+
+
+def _bounded_map(func, items, budget, limit):
+    if budget is None:
+        budget = getattr(settings, 'FANOUT_BUDGET', 30)
+
+    executor = get_executor()
+    deadline = time.monotonic() + budget
+    queue = iter(enumerate(items))
+    results = [None] * len(items)
+    pending = {}
+
+    def submit_next():
+        for index, item in queue:
+            pending[executor.submit(contextvars.copy_context().run, func, item)] = index
+            return
+
+    for _ in range(limit):
+        submit_next()
+
+    while pending:
+        done, _ = wait(pending, timeout=max(deadline - time.monotonic(), 0), return_when=FIRST_COMPLETED)
+        if not done:
+            error = TimeoutError(f"batch exceeded the {budget}s request budget")
+            for future, index in pending.items():
+                future.cancel()
+                results[index] = CallResult(error=error)
+            for index, _ in queue:
+                results[index] = CallResult(error=error)
+            break
+
+        for future in done:
+            index = pending.pop(future)
+            try:
+                results[index] = CallResult(value=future.result())
+            except Exception as e:
+                results[index] = CallResult(error=e)
+            submit_next()
+    return results
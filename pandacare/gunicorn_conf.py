@@ -0,0 +1,82 @@
+"""
+Gunicorn configuration for pandacare.
+
+    gunicorn -c python:pandacare.gunicorn_conf
+
+Requests spend most of their time waiting on the Spring Boot API, so workers
+are threaded (gthread, the default) or event-loop based (GUNICORN_WORKER_CLASS
+=uvicorn, which serves the ASGI app with ASYNC_VIEWS on). Every value can be
+overridden through the environment.
+"""
+
+import math
+import os
+
+
+def cpu_count():
+    """CPUs this container may use: the cgroup quota if one is set, else the scheduler affinity"""
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as f:
+            quota, period = f.read().split()
+        if quota != 'max':
+            return max(1, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+WORKER_CLASSES = {
+    'sync': 'sync',
+    'gthread': 'gthread',
+    'uvicorn': 'uvicorn.workers.UvicornWorker',
+}
+
+worker_mode = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+worker_class = WORKER_CLASSES.get(worker_mode, worker_mode)
+
+if worker_mode == 'uvicorn':
+    # One event loop per core; the async views keep many upstream calls in flight
+    os.environ.setdefault('ASYNC_VIEWS', 'true')
+    wsgi_app = 'pandacare.asgi:application'
+    default_workers = cpu_count() + 1
+else:
+    wsgi_app = 'pandacare.wsgi:application'
+    default_workers = cpu_count() * 2 + 1
+
+workers = int(os.getenv('WEB_CONCURRENCY', default_workers))
+
+# A worker's upstream calls share one connection pool of API_POOL_MAXSIZE: its request
+# threads plus the process-wide fan-out executor (FANOUT_MAX_WORKERS). Threads default
+# to what the fan-out leaves of the pool (same defaults as settings), so calls never
+# open connections the pool then discards. Raise API_POOL_MAXSIZE to add threads.
+api_pool_maxsize = int(os.getenv('API_POOL_MAXSIZE', 32))
+fanout_max_workers = int(os.getenv('FANOUT_MAX_WORKERS', 16))
+default_threads = max(1, api_pool_maxsize - fanout_max_workers) if worker_mode == 'gthread' else 1
+threads = int(os.getenv('GUNICORN_THREADS', default_threads))
+
+bind = os.getenv('GUNICORN_BIND', f"0.0.0.0:{os.getenv('PORT', '8000')}")
+
+# Import Django once in the master so workers share its pages copy-on-write.
+# Connection pools, the fan-out executor and the log writer are rebuilt per process after fork.
+preload_app = os.getenv('GUNICORN_PRELOAD', 'true').lower() == 'true'
+
+# Recycle workers to bound slow leaks; jitter keeps them from restarting together
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+# API_TIMEOUT (the upstream client timeout, same default as settings) plus a margin, so a
+# slow upstream surfaces as an API error rather than a worker killed mid-call
+api_timeout = int(os.getenv('API_TIMEOUT', 30))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', api_timeout + int(os.getenv('GUNICORN_TIMEOUT_MARGIN', 15))))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+
+# Heartbeat files on tmpfs; a disk-backed /tmp can stall workers in containers
+worker_tmp_dir = os.getenv('GUNICORN_WORKER_TMP_DIR', '/dev/shm' if os.path.isdir('/dev/shm') else None)
+
+accesslog = os.getenv('GUNICORN_ACCESS_LOG') or None
+errorlog = '-'
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
@@ -0,0 +1,65 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.http import HttpResponseNotModified
+from django.shortcuts import render
+from django.utils.cache import patch_cache_control, patch_vary_headers
+
+
+def page_etag(request, context):
+    """Weak ETag fingerprinting the URL and the data a page is rendered from.
+
+    ``context`` must be JSON-serialisable plain data (the upstream payloads
+    plus session-derived fields), which the list and profile views build
+    anyway. PAGE_CACHE_VERSION is part of the hash so a deploy that changes
+    templates invalidates every browser copy.
+    """
+    payload = json.dumps(
+        [getattr(settings, 'PAGE_CACHE_VERSION', '1'), request.get_full_path(), context],
+        sort_keys=True,
+        default=str,
+    )
+    return f'W/"{hashlib.sha1(payload.encode()).hexdigest()}"'
+
+
+def has_pending_messages(request):
+    storage = getattr(request, '_messages', None)
+    return storage is not None and len(storage) > 0
+
+
+def etag_matches(request, etag):
+    header = request.headers.get('If-None-Match')
+    if not header:
+        return False
+    candidates = [tag.strip() for tag in header.split(',')]
+    # Weak comparison: W/"x" and "x" match
+    bare = etag.removeprefix('W/')
+    return '*' in candidates or any(tag.removeprefix('W/') == bare for tag in candidates)
+
+
+def apply_cache_headers(response, etag):
+    response['ETag'] = etag
+    patch_cache_control(
+        response,
+        private=True,
+        max_age=getattr(settings, 'PAGE_CACHE_MAX_AGE', 0),
+        must_revalidate=True,
+    )
+    patch_vary_headers(response, ('Cookie',))
+    return response
+
+
+def cached_render(request, template_name, context, status=None):
+    """render() that answers a matching conditional GET with 304 and marks the page privately cacheable.
+
+    Pages carrying flash messages are rendered normally and not cached, so a
+    message is never swallowed by a 304 or replayed from the browser cache.
+    """
+    if request.method not in ('GET', 'HEAD') or has_pending_messages(request):
+        return render(request, template_name, context, status=status)
+
+    etag = page_etag(request, context)
+    if etag_matches(request, etag):
+        return apply_cache_headers(HttpResponseNotModified(), etag)
+    return apply_cache_headers(render(request, template_name, context, status=status), etag)
@@ -0,0 +1,37 @@
+import json
+from functools import lru_cache
+from pathlib import PurePosixPath
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+
+OPTIMIZED_DIR = 'img/optimized'
+MANIFEST_NAME = f'{OPTIMIZED_DIR}/manifest.json'
+
+# Most compact first: <source> order is the browser's preference order
+MIME_TYPES = {'avif': 'image/avif', 'webp': 'image/webp'}
+
+
+def variant_name(source, width, fmt):
+    """Static path of one resized variant, e.g. img/optimized/logo-panda-320w.webp"""
+    return f'{OPTIMIZED_DIR}/{PurePosixPath(source).stem}-{width}w.{fmt}'
+
+
+def _read_manifest():
+    path = finders.find(MANIFEST_NAME)
+    if not path:
+        return {}
+    with open(path) as fh:
+        return json.load(fh)
+
+
+_cached_manifest = lru_cache(maxsize=1)(_read_manifest)
+
+
+def load_manifest():
+    """{source: {'width', 'height', 'variants': {fmt: [{'width', 'path'}]}}}, empty until optimize_images has run"""
+    return _read_manifest() if settings.DEBUG else _cached_manifest()
+
+
+def image_entry(source):
+    return load_manifest().get(source)
@@ -0,0 +1,199 @@
+import contextvars
+import re
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+_UUID = re.compile(r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$')
+
+# Upstream calls made while handling the current request; None outside a request
+_current_calls = contextvars.ContextVar('upstream_calls', default=None)
+
+
+def endpoint_template(endpoint):
+    """Collapse ids in an endpoint path so calls group by route, e.g. /api/doctors/{id}"""
+    path = endpoint.split('?', 1)[0]
+    segments = [
+        '{id}' if _UUID.match(segment) or segment.isdigit() else segment
+        for segment in path.split('/')
+    ]
+    return '/'.join(segments)
+
+
+class UpstreamCall:
+    __slots__ = ('method', 'endpoint', 'status', 'started', 'duration_ms', 'bytes')
+
+    def __init__(self, method, endpoint, status, started, duration_ms, nbytes):
+        self.method = method
+        self.endpoint = endpoint
+        self.status = status
+        self.started = started
+        self.duration_ms = duration_ms
+        self.bytes = nbytes
+
+    def as_dict(self):
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+
+def record_call(method, endpoint, status, started, nbytes=0):
+    """Attach one upstream call, begun at perf_counter() ``started``, to the current request"""
+    calls = _current_calls.get()
+    if calls is not None:
+        duration_ms = (time.perf_counter() - started) * 1000
+        calls.append(UpstreamCall(method.upper(), endpoint_template(endpoint), status, started, duration_ms, nbytes))
+
+
+def upstream_wall_ms(calls):
+    """Wall-clock time with at least one upstream call in flight (parallel calls overlap)"""
+    total, end = 0.0, None
+    for call in sorted(calls, key=lambda c: c.started):
+        call_end = call.started + call.duration_ms / 1000
+        if end is None or call.started >= end:
+            total += call.duration_ms / 1000
+            end = call_end
+        elif call_end > end:
+            total += call_end - end
+            end = call_end
+    return total * 1000
+
+
+def timed_call(method, endpoint, fn):
+    """Run fn (which returns a response) and record its status, latency and size"""
+    started = time.perf_counter()
+    status, nbytes = 0, 0
+    try:
+        response = fn()
+        status, nbytes = response.status_code, len(response.content or b'')
+        return response
+    finally:
+        record_call(method, endpoint, status, started, nbytes)
+
+
+async def atimed_call(method, endpoint, coro_fn):
+    """Async counterpart of timed_call"""
+    started = time.perf_counter()
+    status, nbytes = 0, 0
+    try:
+        response = await coro_fn()
+        status, nbytes = response.status_code, len(response.content or b'')
+        return response
+    finally:
+        record_call(method, endpoint, status, started, nbytes)
+
+
+def current_calls():
+    """Upstream calls recorded so far for the current request"""
+    return list(_current_calls.get() or [])
+
+
+class ViewStats:
+    """Per-view totals of request time and upstream calls, kept in process memory"""
+
+    def __init__(self):
+        self._views = {}
+        self._lock = threading.Lock()
+
+    def add(self, view, total_ms, calls):
+        upstream_ms = upstream_wall_ms(calls)
+        with self._lock:
+            stats = self._views.setdefault(view, {
+                'requests': 0,
+                'total_ms': 0.0,
+                'upstream_ms': 0.0,
+                'upstream_calls': 0,
+                'upstream_bytes': 0,
+                'upstream_errors': 0,
+                'endpoints': {},
+            })
+            stats['requests'] += 1
+            stats['total_ms'] += total_ms
+            stats['upstream_ms'] += upstream_ms
+            stats['upstream_calls'] += len(calls)
+            for call in calls:
+                stats['upstream_bytes'] += call.bytes
+                if not 200 <= call.status < 400:
+                    stats['upstream_errors'] += 1
+                endpoint = stats['endpoints'].setdefault(
+                    f"{call.method} {call.endpoint}", {'calls': 0, 'total_ms': 0.0, 'bytes': 0}
+                )
+                endpoint['calls'] += 1
+                endpoint['total_ms'] += call.duration_ms
+                endpoint['bytes'] += call.bytes
+
+    def snapshot(self, view=None):
+        """Return a copy of the aggregates (with per-request means), optionally for one view"""
+        with self._lock:
+            views = {name: self._summarize(stats) for name, stats in self._views.items()}
+        return views.get(view) if view is not None else views
+
+    @staticmethod
+    def _summarize(stats):
+        requests = stats['requests']
+        summary = dict(stats, endpoints={key: dict(value) for key, value in stats['endpoints'].items()})
+        summary['mean_ms'] = round(stats['total_ms'] / requests, 3)
+        summary['mean_upstream_ms'] = round(stats['upstream_ms'] / requests, 3)
+        summary['mean_upstream_calls'] = round(stats['upstream_calls'] / requests, 3)
+        return summary
+
+    def reset(self):
+        with self._lock:
+            self._views.clear()
+
+
+view_stats = ViewStats()
+
+
+def server_timing(total_ms, calls):
+    """Build the Server-Timing header value for a finished request"""
+    upstream_ms = upstream_wall_ms(calls)
+    return ", ".join([
+        f'upstream;dur={upstream_ms:.1f};desc="{len(calls)} calls"',
+        f'app;dur={max(total_ms - upstream_ms, 0):.1f}',
+        f'total;dur={total_ms:.1f}',
+    ])
+
+
+class UpstreamTimingMiddleware:
+    """Record upstream calls per request, add a Server-Timing header and feed view_stats"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+
+        calls = []
+        token = _current_calls.set(calls)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current_calls.reset(token)
+        return self._finish(request, response, started, calls)
+
+    async def __acall__(self, request):
+        calls = []
+        token = _current_calls.set(calls)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current_calls.reset(token)
+        return self._finish(request, response, started, calls)
+
+    @staticmethod
+    def _finish(request, response, started, calls):
+        total_ms = (time.perf_counter() - started) * 1000
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else 'unresolved'
+        view_stats.add(view, total_ms, calls)
+        response['Server-Timing'] = server_timing(total_ms, calls)
+        return response
@@ -0,0 +1,148 @@
+import atexit
+import datetime
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+
+# Attributes every LogRecord has; anything else on a record came from ``extra=``
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'taskName'}
+
+
+class JsonFormatter(logging.Formatter):
+    """Format a record as one JSON object per line, including any ``extra`` fields"""
+
+    def format(self, record):
+        payload = {
+            'ts': datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                payload[key] = value
+        if record.exc_info:
+            payload['exc'] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+class ThrottleFilter(logging.Filter):
+    """Per-logger sampling and rate limits, decided on the calling thread before enqueueing.
+
+    ``sample_rates`` maps a logger name prefix to the fraction of records below
+    WARNING that are kept. ``rate_limits`` maps a prefix to the records per
+    second allowed at any level; records over the limit are dropped and
+    counted, and the count is attached to the next record that gets through.
+    The longest matching prefix wins.
+    """
+
+    def __init__(self, sample_rates=None, rate_limits=None):
+        super().__init__()
+        self.sample_rates = dict(sample_rates or {})
+        self.rate_limits = dict(rate_limits or {})
+        self._buckets = {}
+        self._sample_counters = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _match(name, table):
+        best = None
+        for prefix in table:
+            if (name == prefix or name.startswith(prefix + '.') or prefix == '') and (
+                best is None or len(prefix) > len(best)
+            ):
+                best = prefix
+        return best
+
+    def filter(self, record):
+        sample_key = self._match(record.name, self.sample_rates)
+        if sample_key is not None and record.levelno < logging.WARNING:
+            rate = self.sample_rates[sample_key]
+            if rate <= 0:
+                return False
+            if rate < 1:
+                # Deterministic 1-in-N keeps sampling cheap and evenly spread
+                with self._lock:
+                    count = self._sample_counters.get(sample_key, 0) + 1
+                    self._sample_counters[sample_key] = count
+                if count % max(round(1 / rate), 1):
+                    return False
+
+        limit_key = self._match(record.name, self.rate_limits)
+        if limit_key is None:
+            return True
+
+        limit = self.rate_limits[limit_key]
+        now = time.monotonic()
+        with self._lock:
+            tokens, last, dropped = self._buckets.get(limit_key, (limit, now, 0))
+            tokens = min(limit, tokens + (now - last) * limit)
+            if tokens < 1:
+                self._buckets[limit_key] = (tokens, now, dropped + 1)
+                return False
+            self._buckets[limit_key] = (tokens - 1, now, 0)
+        if dropped:
+            record.suppressed = dropped
+        return True
+
+
+class QueueLogHandler(logging.handlers.QueueHandler):
+    """Hand records to a bounded queue drained by a background writer thread.
+
+    Formatting and the actual write happen on the writer thread, so the cost
+    on a request thread is a filter check and a queue put. When the queue is
+    full records are dropped (and counted) rather than blocking the request.
+    The writer is restarted after a fork, since threads don't survive it.
+    """
+
+    def __init__(self, maxsize=10000, stream=None):
+        super().__init__(queue.Queue(maxsize))
+        self.target = logging.StreamHandler(stream or sys.stderr)
+        self.dropped = 0
+        self._listener = None
+        self._pid = None
+        self._lock = threading.Lock()
+        atexit.register(self.stop)
+
+    def setFormatter(self, fmt):
+        # The writer thread formats; this handler only forwards records
+        self.target.setFormatter(fmt)
+
+    def _ensure_listener(self):
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._lock:
+            if self._pid != pid:
+                self._listener = logging.handlers.QueueListener(self.queue, self.target, respect_handler_level=True)
+                self._listener.start()
+                self._pid = pid
+
+    def prepare(self, record):
+        # Resolve the message now, since args may be mutated after the call returns
+        from .tracing import current_trace_id
+
+        record.msg = record.getMessage()
+        record.args = None
+        trace_id = current_trace_id()
+        if trace_id and not hasattr(record, 'trace_id'):
+            record.trace_id = trace_id
+        return record
+
+    def enqueue(self, record):
+        self._ensure_listener()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def stop(self):
+        if self._listener is not None and self._pid == os.getpid():
+            self._listener.stop()
+            self._listener = None
+            self._pid = None
@@ -0,0 +1,36 @@
+import hmac
+
+from django.conf import settings
+from django.http import Http404, JsonResponse
+
+from .api_client import inflight
+from .async_api_client import async_inflight_stats
+from .auth import refresh_flight
+from .cache import cache_stats
+from .circuit import breaker_states
+from .instrumentation import view_stats
+
+
+def metrics_allowed(request):
+    """Metrics are open in DEBUG, otherwise they need the METRICS_TOKEN bearer header"""
+    if settings.DEBUG:
+        return True
+    token = getattr(settings, 'METRICS_TOKEN', None)
+    provided = request.headers.get('Authorization', '').removeprefix('Bearer ')
+    return bool(token) and hmac.compare_digest(provided, token)
+
+
+def upstream_metrics(request):
+    """Per-view upstream timing aggregates, cache hit and coalescing rates and circuit breaker states for this process"""
+    if not metrics_allowed(request):
+        raise Http404
+    return JsonResponse({
+        'views': view_stats.snapshot(),
+        'caches': cache_stats(),
+        'coalescing': {
+            'upstream': inflight.stats(),
+            'upstream_async': async_inflight_stats(),
+            'token_refresh': refresh_flight.stats(),
+        },
+        'circuits': breaker_states(),
+    })
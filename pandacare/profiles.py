@@ -0,0 +1,84 @@
+from django.conf import settings
+
+from .api_client import APIError, api_request
+from .cache import MISSING, LRUCache
+
+profile_cache = LRUCache(
+    maxsize=getattr(settings, "PROFILE_CACHE_MAXSIZE", 512),
+    ttl=getattr(settings, "PROFILE_CACHE_TTL", 300),
+    name="profile",
+)
+
+
+def is_client_error(error):
+    """4xx means the endpoint doesn't serve this id, so a fallback endpoint is worth trying"""
+    return error.status_code is not None and 400 <= error.status_code < 500
+
+
+def get_doctor_profile(doctor_id, token=None):
+    """Get a doctor profile payload from /api/doctors/{id}, served from cache when fresh"""
+    return profile_cache.get_or_set(
+        f"doctor:{doctor_id}",
+        lambda: api_request("GET", f"/api/doctors/{doctor_id}", token=token),
+    )
+
+
+def get_caregiver_profile(caregiver_id, token=None):
+    """Get a caregiver profile, falling back to the doctor profile endpoint"""
+    def load():
+        try:
+            profile = api_request("GET", f"/api/caregivers/{caregiver_id}/profile", token=token)
+            if profile:
+                return profile
+        except APIError as e:
+            if not is_client_error(e):
+                raise
+        return get_doctor_profile(caregiver_id, token)
+
+    return profile_cache.get_or_set(f"caregiver:{caregiver_id}", load)
+
+
+async def aget_doctor_profile(doctor_id, token=None):
+    """Async counterpart of get_doctor_profile"""
+    from .async_api_client import async_api_request
+
+    key = f"doctor:{doctor_id}"
+    profile = profile_cache.get(key, MISSING)
+    if profile is MISSING:
+        profile = await async_api_request("GET", f"/api/doctors/{doctor_id}", token=token)
+        if profile:
+            profile_cache.set(key, profile)
+    return profile
+
+
+async def aget_caregiver_profile(caregiver_id, token=None):
+    """Async counterpart of get_caregiver_profile"""
+    from .async_api_client import async_api_request
+
+    key = f"caregiver:{caregiver_id}"
+    profile = profile_cache.get(key, MISSING)
+    if profile is not MISSING:
+        return profile
+
+    try:
+        profile = await async_api_request("GET", f"/api/caregivers/{caregiver_id}/profile", token=token)
+    except APIError as e:
+        if not is_client_error(e):
+            raise
+        profile = None
+    if not profile:
+        profile = await aget_doctor_profile(caregiver_id, token)
+    if profile:
+        profile_cache.set(key, profile)
+    return profile
+
+
+def invalidate_profile(user_id):
+    """Drop a user's cached profiles after a write this front-end made to them.
+
+    Called on registration and on schedule writes (a doctor profile carries its
+    workSchedule). Rating aggregates change through the rating service and are
+    refreshed by PROFILE_CACHE_TTL only.
+    """
+    profile_cache.delete(f"doctor:{user_id}")
+    profile_cache.delete(f"caregiver:{user_id}")
@@ -0,0 +1,68 @@
+from django.conf import settings
+from django.contrib.sessions.backends.cache import SessionStore as CacheSessionStore
+
+from .cache import MISSING, LRUCache
+
+# Per-process tier in front of the shared session cache. Entries live only a few
+# seconds, so a logout in another worker is seen after at most SESSION_LOCAL_TTL.
+local_sessions = LRUCache(
+    maxsize=getattr(settings, 'SESSION_LOCAL_MAXSIZE', 4096),
+    ttl=getattr(settings, 'SESSION_LOCAL_TTL', 5),
+    name='local_sessions',
+)
+
+
+class SessionStore(CacheSessionStore):
+    """Cache-backed session store that serves repeat loads from process memory"""
+
+    def _local_key(self, session_key=None):
+        return self.cache_key_prefix + (session_key or self.session_key)
+
+    def _remember(self, data):
+        if self.session_key:
+            local_sessions.set(self._local_key(), dict(data))
+
+    def load(self):
+        if self.session_key:
+            data = local_sessions.get(self._local_key(), MISSING)
+            if data is not MISSING:
+                return dict(data)
+        data = super().load()
+        if data:
+            self._remember(data)
+        return data
+
+    async def aload(self):
+        if self.session_key:
+            data = local_sessions.get(self._local_key(), MISSING)
+            if data is not MISSING:
+                return dict(data)
+        data = await super().aload()
+        if data:
+            self._remember(data)
+        return data
+
+    def forget_local(self):
+        """Drop this process's copy so the next load reads the shared cache"""
+        if self.session_key:
+            local_sessions.delete(self._local_key())
+
+    def save(self, must_create=False):
+        super().save(must_create)
+        self._remember(self._get_session(no_load=must_create))
+
+    async def asave(self, must_create=False):
+        await super().asave(must_create)
+        self._remember(await self._aget_session(no_load=must_create))
+
+    def delete(self, session_key=None):
+        key = session_key or self.session_key
+        if key:
+            local_sessions.delete(self._local_key(key))
+        super().delete(session_key)
+
+    async def adelete(self, session_key=None):
+        key = session_key or self.session_key
+        if key:
+            local_sessions.delete(self._local_key(key))
+        await super().adelete(session_key)
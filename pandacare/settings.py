@@ -11,7 +11,9 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
 from pathlib import Path
+import json
 import os
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -55,12 +57,16 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'pandacare.instrumentation.UpstreamTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'pandacare.tracing.DebugTraceMiddleware',
+    'pandacare.auth.TokenRefreshMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
+    'pandacare.circuit.CircuitBreakerMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
 ]
@@ -84,6 +90,10 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'pandacare.wsgi.application'
+ASGI_APPLICATION = 'pandacare.asgi.application'
+
+# Route the hot proxy views to their async variants; only enable when served by an ASGI server
+ASYNC_VIEWS = os.getenv('ASYNC_VIEWS', 'false').lower() == 'true'
 
 
 # Database
@@ -136,7 +146,24 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 STATICFILES_DIRS = [
     BASE_DIR / "static",
 ]
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# STATICFILES_STORAGE is ignored since Django 5.1; STORAGES keeps collectstatic emitting hashed names
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'pandacare.storage.StaticFilesStorage'},
+}
+
+# Purged, minified Tailwind bundle built by 'manage.py build_css' before collectstatic
+# (main/templatetags/assets.py). The CDN runtime compiler is only used when TAILWIND_CDN=true,
+# e.g. for local development without the Tailwind CLI.
+TAILWIND_CDN = os.getenv('TAILWIND_CDN', 'false').lower() == 'true'
+TAILWIND_CLI = os.getenv('TAILWIND_CLI', '')
+TAILWIND_OUTPUT = 'css/tailwind.min.css'
+
+# Responsive image variants written by 'manage.py optimize_images' before collectstatic
+# (pandacare/images.py). Globs are relative to static/.
+IMAGE_SOURCES = ['img/*.png', 'img/*.jpg', 'img/*.jpeg']
+IMAGE_WIDTHS = [80, 160, 320, 640, 1024]
+IMAGE_QUALITY = {'avif': 50, 'webp': 78}
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
@@ -144,3 +171,168 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 SPRING_BOOT_API_URL = 'http://localhost:8080/api'
 SPRING_BOOT_API_TIMEOUT = 10 
+
+# Upstream Spring Boot API client (pandacare/api_client.py)
+API_BASE_URL = os.getenv('API_BASE_URL')
+API_TIMEOUT = int(os.getenv('API_TIMEOUT', 30))
+# Sized for GUNICORN_THREADS request threads plus FANOUT_MAX_WORKERS fan-out calls
+# (pandacare/gunicorn_conf.py derives the thread count from the two)
+API_POOL_MAXSIZE = int(os.getenv('API_POOL_MAXSIZE', 32))
+
+# JWKS signing-key cache used to verify login tokens (main/jwks.py)
+JWKS_URL = os.getenv('JWKS_URL')
+JWKS_CACHE_TTL = int(os.getenv('JWKS_CACHE_TTL', 600))
+JWKS_PREFETCH = os.getenv('JWKS_PREFETCH', 'true').lower() == 'true'
+
+# Shared doctor/caregiver profile cache (pandacare/profiles.py)
+PROFILE_CACHE_MAXSIZE = int(os.getenv('PROFILE_CACHE_MAXSIZE', 512))
+PROFILE_CACHE_TTL = int(os.getenv('PROFILE_CACHE_TTL', 300))
+
+# Parallel fan-out of independent upstream calls (pandacare/fanout.py)
+FANOUT_MAX_WORKERS = int(os.getenv('FANOUT_MAX_WORKERS', 16))
+FANOUT_BUDGET = float(os.getenv('FANOUT_BUDGET', 30))
+
+# Batch approve/reject of caregiver reservations (reservasi_caregiver/views.py)
+RESERVATION_BATCH_MAX_ITEMS = int(os.getenv('RESERVATION_BATCH_MAX_ITEMS', 100))
+RESERVATION_BATCH_CONCURRENCY = int(os.getenv('RESERVATION_BATCH_CONCURRENCY', 8))
+
+# Bulk create/delete of schedule slots (schedule/views.py)
+SCHEDULE_BULK_MAX_ITEMS = int(os.getenv('SCHEDULE_BULK_MAX_ITEMS', 50))
+SCHEDULE_BULK_CONCURRENCY = int(os.getenv('SCHEDULE_BULK_CONCURRENCY', 8))
+
+# Per-caregiver weekday interval index for local overlap checks (schedule/intervals.py)
+SCHEDULE_INDEX_MAXSIZE = int(os.getenv('SCHEDULE_INDEX_MAXSIZE', 1024))
+SCHEDULE_INDEX_TTL = int(os.getenv('SCHEDULE_INDEX_TTL', 60))
+
+# Doctor search result cache (doctor_profile/views.py)
+SEARCH_CACHE_MAXSIZE = int(os.getenv('SEARCH_CACHE_MAXSIZE', 256))
+SEARCH_CACHE_TTL = int(os.getenv('SEARCH_CACHE_TTL', 60))
+SEARCH_CACHE_MAX_ENTRY_BYTES = int(os.getenv('SEARCH_CACHE_MAX_ENTRY_BYTES', 256 * 1024))
+# Share entries between queries differing only in letter case; turn off if the backend search is case-sensitive
+SEARCH_CACHE_CASEFOLD = os.getenv('SEARCH_CACHE_CASEFOLD', 'true').lower() == 'true'
+
+# Doctor directory pagination (page is 0-based, forwarded to the backend)
+DOCTOR_PAGE_SIZE = int(os.getenv('DOCTOR_PAGE_SIZE', 12))
+DOCTOR_PAGE_MAX_SIZE = int(os.getenv('DOCTOR_PAGE_MAX_SIZE', 50))
+
+# Per-endpoint-group circuit breaker for the upstream API (pandacare/circuit.py)
+CIRCUIT_BREAKER_ENABLED = os.getenv('CIRCUIT_BREAKER_ENABLED', 'true').lower() == 'true'
+CIRCUIT_WINDOW_SECONDS = int(os.getenv('CIRCUIT_WINDOW_SECONDS', 30))
+CIRCUIT_MIN_CALLS = int(os.getenv('CIRCUIT_MIN_CALLS', 10))
+CIRCUIT_ERROR_RATE = float(os.getenv('CIRCUIT_ERROR_RATE', 0.5))
+CIRCUIT_SLOW_CALL_MS = int(os.getenv('CIRCUIT_SLOW_CALL_MS', 5000))
+CIRCUIT_SLOW_RATE = float(os.getenv('CIRCUIT_SLOW_RATE', 0.5))
+CIRCUIT_OPEN_SECONDS = int(os.getenv('CIRCUIT_OPEN_SECONDS', 15))
+CIRCUIT_HALF_OPEN_PROBES = int(os.getenv('CIRCUIT_HALF_OPEN_PROBES', 1))
+
+# Bearer token for /metrics/upstream/ outside DEBUG (pandacare/metrics.py)
+METRICS_TOKEN = os.getenv('METRICS_TOKEN')
+
+# Sampled debug tracing, off by default (pandacare/tracing.py). A request is traced
+# when it sends X-Debug-Trace: <DEBUG_TRACE_TOKEN>, its user is listed, or it is sampled.
+DEBUG_TRACE_SAMPLE_RATE = float(os.getenv('DEBUG_TRACE_SAMPLE_RATE', 0))
+DEBUG_TRACE_TOKEN = os.getenv('DEBUG_TRACE_TOKEN')
+DEBUG_TRACE_USERS = [user for user in os.getenv('DEBUG_TRACE_USERS', '').split(',') if user]
+
+# Structured JSON logging through a queue drained by a background thread (pandacare/logs.py).
+# LOG_SAMPLE_RATES / LOG_RATE_LIMITS are JSON objects keyed by logger name prefix,
+# e.g. {"reservasi_pacilian": 0.1} keeps 1 in 10 records below WARNING.
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', 10000))
+LOG_SAMPLE_RATES = json.loads(os.getenv('LOG_SAMPLE_RATES', '{}'))
+LOG_RATE_LIMITS = json.loads(os.getenv('LOG_RATE_LIMITS', '{"": 200}'))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'json': {'()': 'pandacare.logs.JsonFormatter'},
+    },
+    'filters': {
+        'throttle': {
+            '()': 'pandacare.logs.ThrottleFilter',
+            'sample_rates': LOG_SAMPLE_RATES,
+            'rate_limits': LOG_RATE_LIMITS,
+        },
+    },
+    'handlers': {
+        'queue': {
+            '()': 'pandacare.logs.QueueLogHandler',
+            'maxsize': LOG_QUEUE_SIZE,
+            'formatter': 'json',
+            'filters': ['throttle'],
+        },
+        'trace': {
+            '()': 'pandacare.logs.QueueLogHandler',
+            'maxsize': LOG_QUEUE_SIZE,
+            'formatter': 'json',
+        },
+    },
+    'root': {
+        'handlers': ['queue'],
+        'level': LOG_LEVEL,
+    },
+    'loggers': {
+        'django': {'handlers': ['queue'], 'level': LOG_LEVEL, 'propagate': False},
+        # Traced requests are already sampled by DebugTraceMiddleware
+        'pandacare.trace': {'handlers': ['trace'], 'level': 'DEBUG', 'propagate': False},
+    },
+}
+
+# Session storage. Sessions only hold access_token, user_id, user_role (and the
+# refresh token). SESSION_BACKEND is one of:
+#   cache          - shared cache at SESSION_CACHE_URL (Redis) fronted by a
+#                    short-lived per-process tier (pandacare/sessions.py);
+#                    the default when SESSION_CACHE_URL is set
+#   db             - the original SQLite-backed sessions; the default otherwise
+#   signed_cookies - no server-side storage, but the tokens travel in a cookie
+#                    that is signed, not encrypted, so only opt in knowingly
+SESSION_CACHE_URL = os.getenv('SESSION_CACHE_URL')
+SESSION_BACKEND = os.getenv('SESSION_BACKEND', 'cache' if SESSION_CACHE_URL else 'db')
+SESSION_ENGINES = {
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+    'cache': 'pandacare.sessions',
+    'db': 'django.contrib.sessions.backends.db',
+}
+if SESSION_BACKEND not in SESSION_ENGINES:
+    raise ImproperlyConfigured(f"SESSION_BACKEND must be one of {', '.join(SESSION_ENGINES)}, not {SESSION_BACKEND!r}")
+if SESSION_BACKEND == 'cache' and not SESSION_CACHE_URL:
+    # A per-process locmem store would lose sessions whenever a request lands on another worker
+    raise ImproperlyConfigured("SESSION_BACKEND=cache needs SESSION_CACHE_URL pointing at a shared cache")
+SESSION_ENGINE = SESSION_ENGINES[SESSION_BACKEND]
+SESSION_CACHE_ALIAS = 'sessions'
+SESSION_LOCAL_TTL = int(os.getenv('SESSION_LOCAL_TTL', 5))
+SESSION_LOCAL_MAXSIZE = int(os.getenv('SESSION_LOCAL_MAXSIZE', 4096))
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Shared between workers; the locmem fallback only serves single-process tools like bench_sessions
+    'sessions': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': SESSION_CACHE_URL,
+    } if SESSION_CACHE_URL else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'sessions',
+    },
+    # Rendered list rows and doctor cards ({% cache %} in the list templates), keyed by
+    # record id plus status/version so a changed record never serves a stale fragment
+    'template_fragments': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'template_fragments',
+        'OPTIONS': {'MAX_ENTRIES': int(os.getenv('TEMPLATE_FRAGMENT_MAX_ENTRIES', 20000))},
+    },
+}
+
+# Refresh the session's access token this many seconds before its JWT exp (pandacare/auth.py)
+TOKEN_REFRESH_MARGIN = int(os.getenv('TOKEN_REFRESH_MARGIN', 60))
+
+# Validators and parsed bodies for conditional (ETag/Last-Modified) upstream GETs (pandacare/api_client.py)
+CONDITIONAL_CACHE_MAXSIZE = int(os.getenv('CONDITIONAL_CACHE_MAXSIZE', 1024))
+CONDITIONAL_CACHE_TTL = int(os.getenv('CONDITIONAL_CACHE_TTL', 600))
+
+# Browser caching of rendered list/profile pages (pandacare/http_cache.py). Bump
+# PAGE_CACHE_VERSION on deploys that change templates to invalidate cached copies.
+PAGE_CACHE_VERSION = os.getenv('PAGE_CACHE_VERSION', '1')
+PAGE_CACHE_MAX_AGE = int(os.getenv('PAGE_CACHE_MAX_AGE', 0))
@@ -0,0 +1,118 @@
+import asyncio
+import hashlib
+import threading
+
+
+def token_scope(token):
+    """Cache scope for data fetched with a token, without keeping the token itself"""
+    return hashlib.sha256(token.encode()).hexdigest() if token else "anonymous"
+
+
+def request_key(method, endpoint, params=None, token=None):
+    """Key identifying an upstream call, scoped to the caller's token"""
+    query = tuple(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+    return (method.upper(), endpoint, query, token_scope(token))
+
+
+def with_coalesce_rate(stats):
+    """Add the share of callers that joined an in-flight call instead of making their own"""
+    callers = stats['executed'] + stats['coalesced']
+    stats['coalesce_rate'] = stats['coalesced'] / callers if callers else 0.0
+    return stats
+
+
+class _Call:
+    __slots__ = ('event', 'value', 'error', 'waiters')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Collapse concurrent calls with the same key into one in-flight execution"""
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.coalesced = 0
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = fn()
+            return call.value
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    def stats(self):
+        with self._lock:
+            return with_coalesce_rate({
+                'executed': self.executed,
+                'coalesced': self.coalesced,
+                'in_flight': len(self._calls),
+            })
+
+
+class AsyncSingleFlight:
+    """Event-loop counterpart of SingleFlight"""
+
+    def __init__(self):
+        self._calls = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    async def do(self, key, coro_fn):
+        future = self._calls.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        self.executed += 1
+        try:
+            value = await coro_fn()
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an unawaited failure does not log a warning
+            future.exception()
+            raise
+        finally:
+            del self._calls[key]
+
+    def stats(self):
+        return with_coalesce_rate({
+            'executed': self.executed,
+            'coalesced': self.coalesced,
+            'in_flight': len(self._calls),
+        })
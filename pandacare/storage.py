@@ -0,0 +1,18 @@
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+
+class StaticFilesStorage(CompressedManifestStaticFilesStorage):
+    """Hashed, compressed static files that degrade to the plain URL for files that do not exist.
+
+    A few templates reference images that are not in static/ yet; with the
+    stock manifest storage those pages would fail with a 500 instead of
+    showing a broken image.
+    """
+
+    manifest_strict = False
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            return name
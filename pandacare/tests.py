@@ -0,0 +1,92 @@
+import base64
+import json
+import time
+from unittest import mock
+
+from django.test import RequestFactory, SimpleTestCase
+
+from .api_client import APIError
+from .auth import SessionExpired, recent_refreshes, refresh_session
+from .circuit import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from .sessions import SessionStore, local_sessions
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    def open_breaker(self, **kwargs):
+        breaker = CircuitBreaker('test', min_calls=2, open_seconds=0, **kwargs)
+        for _ in range(2):
+            breaker.allow().record(True, 1)
+        self.assertEqual(breaker.state, OPEN)
+        return breaker
+
+    def test_late_success_from_before_opening_does_not_close(self):
+        breaker = CircuitBreaker('test', min_calls=2, open_seconds=0)
+        late = breaker.allow()
+        for _ in range(2):
+            breaker.allow().record(True, 1)
+
+        probe = breaker.allow()
+        self.assertEqual(breaker.state, HALF_OPEN)
+        late.record(False, 1)
+        self.assertEqual(breaker.state, HALF_OPEN)
+
+        probe.record(False, 1)
+        self.assertEqual(breaker.state, CLOSED)
+
+    def test_only_the_admitted_probe_decides(self):
+        breaker = self.open_breaker()
+        probe = breaker.allow()
+        self.assertIsNone(breaker.allow())
+
+        probe.record(True, 1)
+        self.assertEqual(breaker.state, OPEN)
+
+    def test_stale_probe_is_ignored_after_reopening(self):
+        breaker = self.open_breaker(half_open_probes=2)
+        slow_probe, failed_probe = breaker.allow(), breaker.allow()
+        failed_probe.record(True, 1)
+        self.assertEqual(breaker.state, OPEN)
+
+        slow_probe.record(False, 1)
+        self.assertEqual(breaker.state, OPEN)
+
+
+def jwt(expires_in):
+    payload = base64.urlsafe_b64encode(json.dumps({'exp': time.time() + expires_in}).encode()).decode()
+    return f"header.{payload.rstrip('=')}.signature"
+
+
+class RefreshSessionTests(SimpleTestCase):
+    def setUp(self):
+        recent_refreshes.clear()
+        local_sessions.clear()
+        self.addCleanup(recent_refreshes.clear)
+        self.addCleanup(local_sessions.clear)
+        self.expired = jwt(-10)
+        stored = SessionStore()
+        stored.update({'access_token': self.expired, 'refresh_token': 'refresh-1'})
+        stored.save()
+        self.addCleanup(stored.delete)
+        self.request = RequestFactory().get('/')
+        self.request.session = SessionStore(stored.session_key)
+        self.request.session.load()
+
+    def refresh(self):
+        rotated = APIError("Unauthorized: refresh token already used", 401)
+        with mock.patch('pandacare.auth.api_request', side_effect=rotated):
+            return refresh_session(self.request)
+
+    def test_tokens_saved_by_another_worker_are_adopted(self):
+        fresh = jwt(300)
+        other = SessionStore(self.request.session.session_key)
+        other.update({'access_token': fresh, 'refresh_token': 'refresh-2'})
+        other.save()
+        # This process still holds the copy it loaded before the other worker saved
+        local_sessions.set(other._local_key(), {'access_token': self.expired, 'refresh_token': 'refresh-1'})
+
+        self.assertEqual(self.refresh(), fresh)
+        self.assertEqual(self.request.session['refresh_token'], 'refresh-2')
+
+    def test_failed_refresh_without_newer_tokens_expires_the_session(self):
+        with self.assertRaises(SessionExpired):
+            self.refresh()
@@ -0,0 +1,104 @@
+import contextvars
+import hmac
+import logging
+import random
+import time
+import uuid
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from .instrumentation import current_calls
+
+TRACE_HEADER = 'X-Debug-Trace'
+
+# Trace id of the current request when it was selected for debug tracing
+_trace_id = contextvars.ContextVar('debug_trace_id', default=None)
+
+logger = logging.getLogger('pandacare.trace')
+
+
+def should_trace(request):
+    """Tracing is off unless the request carries the trace token, the user is listed, or it is sampled"""
+    token = getattr(settings, 'DEBUG_TRACE_TOKEN', None)
+    provided = request.headers.get(TRACE_HEADER)
+    if token and provided and hmac.compare_digest(provided, token):
+        return True
+
+    users = getattr(settings, 'DEBUG_TRACE_USERS', ())
+    if users and str(request.session.get('user_id')) in users:
+        return True
+
+    rate = getattr(settings, 'DEBUG_TRACE_SAMPLE_RATE', 0.0)
+    return rate > 0 and random.random() < rate
+
+
+def current_trace_id():
+    return _trace_id.get()
+
+
+def trace(event, **fields):
+    """Record a structured debug event for the current request; a no-op unless it is traced"""
+    trace_id = _trace_id.get()
+    if trace_id is None:
+        return
+    logger.debug(event, extra={'trace_id': trace_id, 'event': event, **fields})
+
+
+class DebugTraceMiddleware:
+    """Select requests for debug tracing and emit a summary record for each traced one"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not should_trace(request):
+            return self.get_response(request)
+
+        token, started = self._start(request)
+        try:
+            response = self.get_response(request)
+            self._finish(request, response, started)
+            return response
+        finally:
+            _trace_id.reset(token)
+
+    async def __acall__(self, request):
+        from asgiref.sync import sync_to_async
+
+        if not await sync_to_async(should_trace)(request):
+            return await self.get_response(request)
+
+        token, started = self._start(request)
+        try:
+            response = await self.get_response(request)
+            self._finish(request, response, started)
+            return response
+        finally:
+            _trace_id.reset(token)
+
+    @staticmethod
+    def _start(request):
+        return _trace_id.set(uuid.uuid4().hex[:16]), time.perf_counter()
+
+    @staticmethod
+    def _finish(request, response, started):
+        match = getattr(request, 'resolver_match', None)
+        response[TRACE_HEADER] = _trace_id.get()
+        trace(
+            'request',
+            method=request.method,
+            path=request.path,
+            view=match.view_name if match else None,
+            status=response.status_code,
+            duration_ms=round((time.perf_counter() - started) * 1000, 3),
+            upstream=[call.as_dict() for call in current_calls()],
+        )
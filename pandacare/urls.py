@@ -18,6 +18,7 @@ from django.contrib import admin
 from django.urls import include, path
 
 from main.views import HomePageView
+from pandacare.metrics import upstream_metrics
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -29,4 +30,5 @@ urlpatterns = [
     path('doctors/', include('doctor_profile.urls', namespace='doctor_profile')),
     path('pacillian-reservation/', include('reservasi_pacilian.urls')),
     path('rating/', include('rating.urls')),
+    path('metrics/upstream/', upstream_metrics, name='upstream_metrics'),
 ]
@@ -1,3 +1,92 @@
-from django.test import TestCase
+import threading
+import time
+from unittest import mock
 
-# Create your tests here.
+from django.test import SimpleTestCase
+
+from pandacare.profiles import profile_cache
+
+from .views import MAX_FETCH_WORKERS, RatingContextBuilder
+
+
+def reservation(index, caregiver_id, status='APPROVED'):
+    return {
+        'id': f"consultation-{index}",
+        'statusReservasi': status,
+        'idSchedule': {'caregiverId': caregiver_id, 'date': f"2025-01-{index + 1:02d}",
+                       'startTime': '09:00', 'endTime': '10:00'},
+    }
+
+
+class FakeAPI:
+    """Records upstream calls and how many were in flight at once"""
+
+    def __init__(self, rated=(), delay=0.0):
+        self.rated = set(rated)
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, method, endpoint, data=None, token=None, **kwargs):
+        with self.lock:
+            self.calls.append((method, endpoint))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            if endpoint.startswith('/api/doctors/'):
+                return {'name': endpoint.rsplit('/', 1)[-1], 'speciality': 'Umum'}
+            consultation_id = endpoint.split('/')[4]
+            if endpoint.endswith('/rating/status'):
+                return {'data': {'hasRated': consultation_id in self.rated}}
+            return {'data': {'rating': {'ratingScore': 5, 'ulasan': 'ok'}}}
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def count(self, suffix):
+        return sum(1 for _, endpoint in self.calls if endpoint.endswith(suffix))
+
+
+class BuildConsultationListTests(SimpleTestCase):
+    def setUp(self):
+        profile_cache.clear()
+        self.addCleanup(profile_cache.clear)
+
+    def build(self, reservations, api):
+        with mock.patch('rating.views.api_request', api), mock.patch('pandacare.profiles.api_request', api):
+            return RatingContextBuilder.build_consultation_list(reservations, 'token')
+
+    def test_upstream_calls_are_deduplicated_per_doctor(self):
+        reservations = [reservation(i, f"doctor-{i % 2}") for i in range(6)]
+        reservations.append(reservation(6, 'doctor-9', status='WAITING'))
+        api = FakeAPI(rated={'consultation-0', 'consultation-3', 'consultation-4'})
+
+        consultations = self.build(reservations, api)
+
+        # One profile per distinct doctor, one status per consultation, one rating per rated one
+        self.assertEqual(api.count('/api/doctors/doctor-0'), 1)
+        self.assertEqual(api.count('/api/doctors/doctor-1'), 1)
+        self.assertEqual(api.count('/rating/status'), 6)
+        self.assertEqual(api.count('/ratings'), 3)
+        self.assertEqual(len(api.calls), 11)
+        self.assertEqual([c['id'] for c in consultations], [f"consultation-{i}" for i in range(6)])
+        self.assertEqual(consultations[1]['doctor_name'], 'Dr. doctor-1')
+        self.assertEqual([c['has_rating'] for c in consultations], [True, False, False, True, True, False])
+
+    def test_in_flight_calls_are_bounded(self):
+        reservations = [reservation(i, f"doctor-{i}") for i in range(3 * MAX_FETCH_WORKERS)]
+        api = FakeAPI(delay=0.01)
+
+        self.build(reservations, api)
+
+        self.assertEqual(len(api.calls), 2 * len(reservations))
+        self.assertLessEqual(api.max_in_flight, MAX_FETCH_WORKERS)
+
+    def test_no_calls_without_approved_reservations(self):
+        api = FakeAPI()
+
+        self.assertEqual(self.build([reservation(0, 'doctor-0', status='WAITING')], api), [])
+        self.assertEqual(api.calls, [])
@@ -5,9 +5,17 @@ from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 import requests
 import uuid
+import logging
 from datetime import datetime
 from functools import wraps
 from main.views import api_request, get_base_context, is_logged_in
+from pandacare.fanout import fan_out, fan_out_map
+from pandacare.profiles import get_doctor_profile
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on concurrent upstream calls made while building one rating list
+MAX_FETCH_WORKERS = 8
 
 
 def require_pacilian_auth(view_func):
@@ -50,7 +58,7 @@ class RatingUtils:
             return "Unknown Doctor", ""
         
         try:
-            doctor_response = api_request("GET", f"/api/doctors/{caregiver_id}", token=token)
+            doctor_response = get_doctor_profile(caregiver_id, token)
             if doctor_response:
                 name = f"Dr. {doctor_response.get('name', 'Unknown')}"
                 speciality = doctor_response.get('speciality', '')
@@ -85,7 +93,7 @@ class RatingAPI:
     @staticmethod
     def get_reservations(patient_id, token):
         """Get all patient reservations"""
-        return api_request("GET", f"/api/reservasi-konsultasi/{patient_id}", token=token)
+        return api_request("GET", f"/api/reservasi-konsultasi/{patient_id}", token=token, revalidate=True)
     
     @staticmethod
     def check_rating_status(consultation_id, token):
@@ -96,6 +104,13 @@ class RatingAPI:
         except Exception:
             return False
     
+    @staticmethod
+    def get_rating_info(consultation_id, token):
+        """Get (has_rating, existing_rating) for a consultation"""
+        has_rating = RatingAPI.check_rating_status(consultation_id, token)
+        existing_rating = RatingAPI.get_existing_rating(consultation_id, token) if has_rating else None
+        return has_rating, existing_rating
+    
     @staticmethod
     def get_existing_rating(consultation_id, token):
         """Get existing rating for consultation"""
@@ -143,15 +158,23 @@ class RatingContextBuilder:
     """Builder for creating context data for different views"""
     
     @staticmethod
-    def build_consultation_data(reservation, token):
+    def get_caregiver_id(reservation):
+        schedule = reservation.get('idSchedule', {})
+        return schedule.get('caregiverId') if schedule else None
+    
+    @staticmethod
+    def build_consultation_data(reservation, token, doctor_info=None, rating_info=None):
         """Build consultation data for list view"""
         consultation_id = reservation.get('id')
         schedule = reservation.get('idSchedule', {})
-        caregiver_id = schedule.get('caregiverId') if schedule else None
-        doctor_name, doctor_speciality = RatingUtils.get_doctor_info(caregiver_id, token)
+        caregiver_id = RatingContextBuilder.get_caregiver_id(reservation)
         
-        has_rating = RatingAPI.check_rating_status(consultation_id, token)
-        existing_rating = RatingAPI.get_existing_rating(consultation_id, token) if has_rating else None
+        if doctor_info is None:
+            doctor_info = RatingUtils.get_doctor_info(caregiver_id, token)
+        if rating_info is None:
+            rating_info = RatingAPI.get_rating_info(consultation_id, token)
+        doctor_name, doctor_speciality = doctor_info
+        has_rating, existing_rating = rating_info
         
         return {
             'id': consultation_id,
@@ -166,6 +189,40 @@ class RatingContextBuilder:
             'status': reservation.get('statusReservasi')
         }
     
+    @staticmethod
+    def build_consultation_list(reservations, token):
+        """Build list view data for approved reservations.
+
+        Doctor lookups are deduplicated by caregiver id and all upstream calls
+        go through the shared fan-out pool with at most MAX_FETCH_WORKERS in
+        flight, so a page costs one call per distinct doctor plus one or two
+        per consultation regardless of ordering.
+        """
+        approved = [r for r in reservations if r.get('statusReservasi') == 'APPROVED']
+        if not approved:
+            return []
+        
+        caregiver_ids = list(dict.fromkeys(
+            RatingContextBuilder.get_caregiver_id(r) for r in approved
+        ))
+        jobs = [(RatingUtils.get_doctor_info, caregiver_id) for caregiver_id in caregiver_ids]
+        jobs += [(RatingAPI.get_rating_info, r.get('id')) for r in approved]
+        results = fan_out_map(lambda job: job[0](job[1], token), jobs, limit=MAX_FETCH_WORKERS)
+        
+        doctor_infos = {
+            caregiver_id: result.get(("Unknown Doctor", ""))
+            for caregiver_id, result in zip(caregiver_ids, results)
+        }
+        return [
+            RatingContextBuilder.build_consultation_data(
+                reservation,
+                token,
+                doctor_info=doctor_infos[RatingContextBuilder.get_caregiver_id(reservation)],
+                rating_info=result.get((False, None))
+            )
+            for reservation, result in zip(approved, results[len(caregiver_ids):])
+        ]
+    
     @staticmethod
     def build_form_context(consultation, patient_id, token, mode='add', existing_rating=None):
         """Build context for form views (add/edit)"""
@@ -222,11 +279,9 @@ class RatingListView(View):
                 return render(request, self.template_name, context)
 
             # Filter approved consultations and build data
-            approved_consultations = [
-                RatingContextBuilder.build_consultation_data(reservation, session_data['token'])
-                for reservation in reservations_response
-                if reservation.get('statusReservasi') == 'APPROVED'
-            ]
+            approved_consultations = RatingContextBuilder.build_consultation_list(
+                reservations_response, session_data['token']
+            )
 
             # Sort by consultation date (newest first)
             approved_consultations.sort(key=lambda x: x.get('consultation_date') or '', reverse=True)
@@ -239,7 +294,7 @@ class RatingListView(View):
         except Exception as e:
             messages.error(request, f"Error loading consultations: {str(e)}")
             context['consultations'] = []
-            print(f"Error loading consultations: {str(e)}")
+            logger.warning("Error loading consultations: %s", e)
 
         return render(request, self.template_name, context)
 
@@ -248,11 +303,12 @@ class RatingFormMixin:
     """Mixin for form-based rating views (add/edit)"""
     template_name = 'rating_form.html'
     
-    def get_consultation_context(self, request, consultation_id, mode='add'):
+    def get_consultation_context(self, request, consultation_id, mode='add', reservations=None):
         """Get consultation context for form views"""
         session_data = RatingUtils.get_session_data(request)
         
-        reservations = RatingAPI.get_reservations(session_data['patient_id'], session_data['token'])
+        if reservations is None:
+            reservations = RatingAPI.get_reservations(session_data['patient_id'], session_data['token'])
         consultation = RatingUtils.find_consultation(reservations, consultation_id)
         
         if not consultation:
@@ -321,12 +377,19 @@ class AddRatingView(RatingFormMixin, View):
         context = get_base_context(request)
         session_data = RatingUtils.get_session_data(request)
         
+        results = fan_out({
+            'has_rating': lambda: RatingAPI.check_rating_status(consultation_id, session_data['token']),
+            'reservations': lambda: RatingAPI.get_reservations(session_data['patient_id'], session_data['token']),
+        })
+        
         # Check if rating already exists
-        if RatingAPI.check_rating_status(consultation_id, session_data['token']):
+        if results['has_rating'].get(False):
             messages.warning(request, "Konsultasi ini sudah memiliki rating. Gunakan fitur edit untuk mengubah.")
             return redirect("rating:list", id_pacilian=session_data['patient_id'])
         
-        consultation_context, error = self.get_consultation_context(request, consultation_id, 'add')
+        consultation_context, error = self.get_consultation_context(
+            request, consultation_id, 'add', reservations=results['reservations'].unwrap()
+        )
         if error:
             messages.error(request, error)
             return redirect("rating:list", id_pacilian=session_data['patient_id'])
@@ -425,5 +488,5 @@ class ViewRatingView(View):
 
         except Exception as e:
             messages.error(request, f"Error loading rating details: {str(e)}")
-            print(f"Error loading rating details: {str(e)}")
+            logger.warning("Error loading rating details: %s", e)
             return redirect("rating:list", id_pacilian=session_data['patient_id'])
\ No newline at end of file
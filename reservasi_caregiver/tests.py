@@ -0,0 +1,132 @@
+import json
+import threading
+import time
+import uuid
+from importlib import import_module
+from unittest import mock
+
+from django.conf import settings
+from django.test import Client, SimpleTestCase, override_settings
+from django.urls import reverse
+
+from pandacare.api_client import APIError, APIPermissionError
+
+SIGNED_COOKIES = 'django.contrib.sessions.backends.signed_cookies'
+
+
+def reservation_id(number):
+    return str(uuid.UUID(int=200 + number))
+
+
+class FakeReservationAPI:
+    """Stands in for api_request: accepts status updates, fails chosen ones and tracks concurrency"""
+
+    def __init__(self, failing=None, delay=0.0):
+        self.failing = failing or {}
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, method, endpoint, data=None, token=None, **kwargs):
+        reservation = endpoint.split('/')[4]
+        with self.lock:
+            self.calls.append((method, reservation, data))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            if reservation in self.failing:
+                raise self.failing[reservation]
+            return {"status": 200}
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def sent(self):
+        return sorted(reservation for _, reservation, _ in self.calls)
+
+
+@override_settings(SESSION_ENGINE=SIGNED_COOKIES, ALLOWED_HOSTS=['*'])
+class BatchReservationActionViewTests(SimpleTestCase):
+    def setUp(self):
+        self.client = Client()
+        session = import_module(SIGNED_COOKIES).SessionStore()
+        session.update({'access_token': 'token', 'user_id': str(uuid.UUID(int=1)), 'user_role': 'caregiver'})
+        session.save()
+        self.client.cookies[settings.SESSION_COOKIE_NAME] = session.session_key
+
+    def post(self, api, body):
+        with mock.patch('reservasi_caregiver.views.api_request', api):
+            response = self.client.post(
+                reverse('reservasi_caregiver:batch_reservation_action'),
+                json.dumps(body),
+                content_type='application/json',
+            )
+        return response.status_code, response.json()
+
+    def test_results_are_reported_per_item(self):
+        api = FakeReservationAPI(failing={reservation_id(2): APIError("API error 500: boom", 500)})
+        status, data = self.post(api, {'action': 'approve', 'items': [
+            {'id': reservation_id(1)},
+            {'id': reservation_id(2), 'action': 'reject'},
+            {'id': reservation_id(3), 'action': 'reschedule', 'newScheduleId': 'schedule-1'},
+        ]})
+
+        self.assertEqual(status, 200)
+        self.assertEqual([r['success'] for r in data['results']], [True, False, True])
+        self.assertEqual(data['results'][0]['message'], "Reservation approved successfully")
+        self.assertIn("Error rejecting reservation", data['results'][1]['error'])
+        self.assertEqual((data['succeeded'], data['failed'], data['success']), (2, 1, False))
+        self.assertNotIn('redirect', data)
+        self.assertEqual(
+            sorted((reservation, body['status']) for _, reservation, body in api.calls),
+            [(reservation_id(1), 'APPROVED'), (reservation_id(2), 'REJECTED'), (reservation_id(3), 'ON_RESCHEDULE')],
+        )
+
+    def test_invalid_and_duplicate_items_are_not_sent(self):
+        api = FakeReservationAPI()
+        status, data = self.post(api, {'action': 'approve', 'items': [
+            reservation_id(1),
+            'not-a-uuid',
+            {'id': reservation_id(1).upper()},
+            {'id': reservation_id(2), 'action': 'reschedule'},
+            {'id': reservation_id(3), 'action': 'archive'},
+        ]})
+
+        errors = [r.get('error') for r in data['results']]
+        self.assertEqual(errors, [None, "Invalid reservation ID", "Duplicate reservation ID",
+                                  "New schedule ID is required", "Invalid action"])
+        self.assertEqual((data['succeeded'], data['failed']), (1, 4))
+        self.assertEqual(api.sent(), [reservation_id(1)])
+
+    def test_oversized_and_empty_batches_are_rejected(self):
+        api = FakeReservationAPI()
+        with self.settings(RESERVATION_BATCH_MAX_ITEMS=2):
+            status, data = self.post(api, {'action': 'approve', 'items': [reservation_id(n) for n in range(3)]})
+        self.assertEqual((status, data['error']), (400, "At most 2 reservations per batch"))
+
+        status, data = self.post(api, {'action': 'approve', 'items': []})
+        self.assertEqual(status, 400)
+        self.assertEqual(api.calls, [])
+
+    @override_settings(RESERVATION_BATCH_CONCURRENCY=1)
+    def test_refused_session_stops_the_rest_of_the_batch(self):
+        api = FakeReservationAPI(failing={reservation_id(1): APIPermissionError("Forbidden", 403)})
+        status, data = self.post(api, {'action': 'approve', 'items': [reservation_id(n) for n in range(1, 5)]})
+
+        self.assertEqual(data['redirect'], "/login/")
+        self.assertEqual(data['succeeded'], 0)
+        self.assertIn("Not sent", data['results'][3]['error'])
+        self.assertEqual(api.sent(), [reservation_id(1)])
+
+    @override_settings(RESERVATION_BATCH_CONCURRENCY=3)
+    def test_in_flight_updates_are_bounded(self):
+        api = FakeReservationAPI(delay=0.01)
+        status, data = self.post(api, {'action': 'approve', 'items': [reservation_id(n) for n in range(12)]})
+
+        self.assertEqual(data['succeeded'], 12)
+        self.assertEqual(len(api.calls), 12)
+        self.assertLessEqual(api.max_in_flight, 3)
+        self.assertGreater(api.max_in_flight, 1)
@@ -4,11 +4,18 @@ from django.views import View
 from django.contrib import messages
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
-import requests
 import json
-import os
-
-API_BASE_URL = os.getenv("API_BASE_URL")
+import logging
+import threading
+import uuid
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from pandacare.api_client import APIPermissionError, api_request
+from pandacare.async_api_client import async_api_request, async_session_data
+from pandacare.fanout import fan_out_map
+from pandacare.http_cache import cached_render
+
+logger = logging.getLogger(__name__)
 
 def is_logged_in(request):
     return bool(request.session.get("access_token"))
@@ -22,44 +29,10 @@ def clear_session_and_redirect(request, message="Session expired. Please login a
     messages.error(request, message)
     return redirect("main:login")
 
-def api_request(method, endpoint, data=None, token=None, params=None):
-    if not API_BASE_URL:
-        raise Exception("API_BASE_URL environment variable not set")
-
-    url = f"{API_BASE_URL}{endpoint}"
-    headers = {"Content-Type": "application/json"}
-
-    if token:
-        headers["Authorization"] = f"Bearer {token}"
-
-    try:
-        kwargs = {"headers": headers, "timeout": 30}
-        
-        if method.upper() == "GET" and params:
-            kwargs["params"] = params
-        elif data is not None:
-            kwargs["json"] = data
-
-        response = requests.request(method, url, **kwargs)
-
-        if response.status_code in [200, 201, 204]:
-            try:
-                return response.json()
-            except json.JSONDecodeError:
-                return response.text if response.text else {"success": True}
-        elif response.status_code == 401:
-            raise PermissionError("Session expired. Please login again.")
-        elif response.status_code == 403:
-            raise PermissionError(f"Access denied: {response.text}")
-        else:
-            raise Exception(f"API error {response.status_code}: {response.text}")
-
-    except requests.exceptions.Timeout:
-        raise Exception("Request timeout - server may be down")
-    except requests.exceptions.ConnectionError:
-        raise Exception("Connection error - cannot reach server")
-    except Exception as e:
-        raise Exception(f"API Error: {str(e)}")
+async def aclear_session_and_redirect(request, message="Session expired. Please login again."):
+    await request.session.aflush()
+    messages.error(request, message)
+    return redirect("main:login")
 
 def check_caregiver_access(request, caregiver_id=None):
     if not is_logged_in(request):
@@ -76,6 +49,22 @@ def check_caregiver_access(request, caregiver_id=None):
     
     return True, None
 
+async def acheck_caregiver_access(request, caregiver_id=None):
+    session_data = await async_session_data(request)
+    if not session_data['token']:
+        return False, "Please login first"
+    
+    if not all(session_data.values()):
+        return False, "Session expired"
+    
+    if session_data['user_role'] != "caregiver":
+        return False, "Access denied"
+    
+    if caregiver_id and str(session_data['user_id']) != str(caregiver_id):
+        return False, "Access denied"
+    
+    return True, None
+
 def transform_reservation_data(reservation):
     schedule_data = reservation.get('idSchedule', {})
     if not isinstance(schedule_data, dict):
@@ -129,7 +118,8 @@ class CaregiverSchedulesView(View):
                 "GET",
                 f"/api/caregivers/{caregiver_id}/schedules",
                 params=params,
-                token=token
+                token=token,
+                revalidate=True
             )
             return JsonResponse(response, safe=False)
 
@@ -152,36 +142,46 @@ class ReservationListView(View):
         day_filter = request.GET.get('day', '').strip()
 
         try:
-            params = {}
-            if status_filter:
-                params['status'] = status_filter
-            if day_filter:
-                params['day'] = day_filter
-            
             reservations_response = api_request(
                 "GET",
                 f"/api/caregivers/{caregiver_id}/reservations",
-                params=params,
-                token=token
+                params=self._build_params(status_filter, day_filter),
+                token=token,
+                revalidate=True
             )
+            transformed_reservations = self._transform_reservations(reservations_response)
 
-            reservations = extract_reservations_from_response(reservations_response)
-            transformed_reservations = []
-            
-            for reservation in reservations:
-                try:
-                    transformed_reservations.append(transform_reservation_data(reservation))
-                except Exception as e:
-                    print(f"Warning: Failed to transform reservation {reservation.get('id', 'unknown')}: {e}")
-                    transformed_reservations.append(reservation)
-
-        except PermissionError as e:
-            return clear_session_and_redirect(request, str(e))
+        except PermissionError:
+            return clear_session_and_redirect(request)
         except Exception as e:
             messages.error(request, f"Error loading reservations: {str(e)}")
             transformed_reservations = []
 
-        context = {
+        context = self._build_context(caregiver_id, transformed_reservations, status_filter, day_filter)
+        return cached_render(request, self.template_name, context)
+
+    def _build_params(self, status_filter, day_filter):
+        params = {}
+        if status_filter:
+            params['status'] = status_filter
+        if day_filter:
+            params['day'] = day_filter
+        return params
+
+    def _transform_reservations(self, reservations_response):
+        reservations = extract_reservations_from_response(reservations_response)
+        transformed_reservations = []
+        
+        for reservation in reservations:
+            try:
+                transformed_reservations.append(transform_reservation_data(reservation))
+            except Exception as e:
+                logger.warning("Failed to transform reservation %s: %s", reservation.get('id', 'unknown'), e)
+                transformed_reservations.append(reservation)
+        return transformed_reservations
+
+    def _build_context(self, caregiver_id, transformed_reservations, status_filter, day_filter):
+        return {
             "reservations": transformed_reservations,
             "caregiver_id": str(caregiver_id),
             "user_id": str(caregiver_id),
@@ -196,7 +196,59 @@ class ReservationListView(View):
             "total_reservations": len(transformed_reservations),
         }
 
-        return render(request, self.template_name, context)
+class AsyncReservationListView(ReservationListView):
+    """ReservationListView for ASGI deployments; awaits the upstream call on the event loop"""
+
+    async def get(self, request, caregiver_id):
+        is_valid, error_msg = await acheck_caregiver_access(request, caregiver_id)
+        if not is_valid:
+            if "login" in error_msg.lower() or "expired" in error_msg.lower():
+                return await aclear_session_and_redirect(request, error_msg)
+            messages.error(request, error_msg)
+            return redirect("main:home")
+
+        token = await request.session.aget("access_token")
+        status_filter = request.GET.get('status', '').strip()
+        day_filter = request.GET.get('day', '').strip()
+
+        try:
+            reservations_response = await async_api_request(
+                "GET",
+                f"/api/caregivers/{caregiver_id}/reservations",
+                params=self._build_params(status_filter, day_filter),
+                token=token,
+                revalidate=True
+            )
+            transformed_reservations = self._transform_reservations(reservations_response)
+
+        except PermissionError:
+            return await aclear_session_and_redirect(request)
+        except Exception as e:
+            messages.error(request, f"Error loading reservations: {str(e)}")
+            transformed_reservations = []
+
+        context = self._build_context(caregiver_id, transformed_reservations, status_filter, day_filter)
+        return await sync_to_async(cached_render)(request, self.template_name, context)
+
+def build_status_update(action, new_schedule_id=None):
+    """Upstream status payload and success message for an action; ValueError if it is invalid"""
+    if action == "approve":
+        return {"status": "APPROVED"}, "Reservation approved successfully"
+    if action == "reject":
+        return {"status": "REJECTED"}, "Reservation rejected successfully"
+    if action == "reschedule":
+        if not new_schedule_id:
+            raise ValueError("New schedule ID is required")
+        return {"status": "ON_RESCHEDULE", "newScheduleId": new_schedule_id}, "Reservation rescheduled successfully"
+    raise ValueError("Invalid action")
+
+def update_reservation_status(reservation_id, data, token):
+    return api_request(
+        "PATCH",
+        f"/api/caregivers/reservations/{reservation_id}/status",
+        data=data,
+        token=token
+    )
 
 @method_decorator(csrf_exempt, name='dispatch')
 class ReservationActionView(View):
@@ -212,31 +264,20 @@ class ReservationActionView(View):
         token = request.session.get("access_token")
 
         try:
-            if action == "approve":
-                data = {"status": "APPROVED"}
-                message = "Reservation approved successfully"
-            elif action == "reject":
-                data = {"status": "REJECTED"}
-                message = "Reservation rejected successfully"
-            elif action == "reschedule":
+            new_schedule_id = None
+            if action == "reschedule":
                 try:
                     body = json.loads(request.body.decode("utf-8"))
                     new_schedule_id = body.get('newScheduleId')
-                    if not new_schedule_id:
-                        return JsonResponse({"error": "New schedule ID is required"}, status=400)
-                    data = {"status": "ON_RESCHEDULE", "newScheduleId": new_schedule_id}
-                    message = "Reservation rescheduled successfully"
                 except json.JSONDecodeError:
                     return JsonResponse({"error": "Invalid JSON input"}, status=400)
-            else:
-                return JsonResponse({"error": "Invalid action"}, status=400)
-
-            api_request(
-                "PATCH",
-                f"/api/caregivers/reservations/{reservation_id}/status",
-                data=data,
-                token=token
-            )
+
+            try:
+                data, message = build_status_update(action, new_schedule_id)
+            except ValueError as e:
+                return JsonResponse({"error": str(e)}, status=400)
+
+            update_reservation_status(reservation_id, data, token)
 
             return JsonResponse({"success": True, "message": message})
 
@@ -258,4 +299,96 @@ class RejectReservationView(ReservationActionView):
 @method_decorator(csrf_exempt, name='dispatch')
 class RescheduleReservationView(ReservationActionView):
     def post(self, request, reservation_id):
-        return super().post(request, reservation_id, "reschedule")
\ No newline at end of file
+        return super().post(request, reservation_id, "reschedule")
+
+@method_decorator(csrf_exempt, name='dispatch')
+class BatchReservationActionView(View):
+    """Apply approve/reject/reschedule to many reservations, sending the status updates concurrently"""
+
+    def post(self, request):
+        is_valid, error_msg = check_caregiver_access(request)
+        if not is_valid:
+            status_code = 401 if "login" in error_msg.lower() or "expired" in error_msg.lower() else 403
+            response_data = {"error": error_msg}
+            if status_code == 401:
+                response_data["redirect"] = "/login/"
+            return JsonResponse(response_data, status=status_code)
+
+        try:
+            body = json.loads(request.body.decode("utf-8"))
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return JsonResponse({"error": "Invalid JSON input"}, status=400)
+
+        items = body.get("items") if isinstance(body, dict) else None
+        if not isinstance(items, list) or not items:
+            return JsonResponse({"error": "items must be a non-empty list"}, status=400)
+
+        max_items = getattr(settings, "RESERVATION_BATCH_MAX_ITEMS", 100)
+        if len(items) > max_items:
+            return JsonResponse({"error": f"At most {max_items} reservations per batch"}, status=400)
+
+        results, jobs = self._validate(items, body.get("action"))
+        token = request.session.get("access_token")
+        denied = threading.Event()
+
+        def send(job):
+            # Once the API refuses this session, the items not yet sent are skipped
+            if denied.is_set():
+                raise APIPermissionError("Not sent: the API refused an earlier item", 403)
+            try:
+                return update_reservation_status(job["id"], job["data"], token)
+            except APIPermissionError:
+                denied.set()
+                raise
+
+        outcomes = fan_out_map(send, jobs, limit=getattr(settings, "RESERVATION_BATCH_CONCURRENCY", 8))
+
+        unauthorized = False
+        for job, outcome in zip(jobs, outcomes):
+            result = results[job["index"]]
+            if outcome.ok:
+                result.update(success=True, message=job["message"])
+                continue
+            error = outcome.error
+            unauthorized = unauthorized or isinstance(error, APIPermissionError)
+            logger.warning("Batch reservation update failed", extra={
+                "reservation_id": job["id"], "action": result["action"], "error": str(error),
+            })
+            result.update(success=False, error=f"Error {result['action']}ing reservation: {error}")
+
+        succeeded = sum(1 for result in results if result["success"])
+        response_data = {
+            "success": succeeded == len(results),
+            "succeeded": succeeded,
+            "failed": len(results) - succeeded,
+            "results": results,
+        }
+        if unauthorized:
+            response_data["redirect"] = "/login/"
+        return JsonResponse(response_data)
+
+    def _validate(self, items, default_action):
+        """Per-item result stubs, plus the upstream calls for the items that passed validation"""
+        results, jobs, seen = [], [], set()
+        for index, item in enumerate(items):
+            item = item if isinstance(item, dict) else {"id": item}
+            action = item.get("action") or default_action
+            result = {"id": item.get("id"), "action": action, "success": False}
+            results.append(result)
+            try:
+                reservation_id = str(uuid.UUID(str(item.get("id"))))
+            except ValueError:
+                result["error"] = "Invalid reservation ID"
+                continue
+            result["id"] = reservation_id
+            if reservation_id in seen:
+                result["error"] = "Duplicate reservation ID"
+                continue
+            seen.add(reservation_id)
+            try:
+                data, message = build_status_update(action, item.get("newScheduleId"))
+            except ValueError as e:
+                result["error"] = str(e)
+                continue
+            jobs.append({"index": index, "id": reservation_id, "data": data, "message": message})
+        return results, jobs
@@ -1,10 +1,13 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
 app_name = 'reservasi_pacilian'
 
+list_reservasi = views.alist_reservasi if settings.ASYNC_VIEWS else views.list_reservasi
+
 urlpatterns = [
-    path('reservasi/<uuid:id_pacilian>/', views.list_reservasi, name='pacilian_reservasi_list'),
+    path('reservasi/<uuid:id_pacilian>/', list_reservasi, name='pacilian_reservasi_list'),
     path('reservasi/request/', views.ReservationRequestView.as_view(), name='request_reservasi'),
     path('reservasi/<uuid:id>/accept-change/', views.accept_change, name='pacilian_accept_change'),
     path('reservasi/<uuid:id>/reject-change/', views.reject_change, name='pacilian_reject_change'),
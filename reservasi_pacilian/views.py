@@ -1,5 +1,4 @@
 import os
-import requests
 import json
 import base64
 import datetime
@@ -11,7 +10,14 @@ from django.views import View
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.utils.decorators import method_decorator
-import traceback
+import logging
+from asgiref.sync import sync_to_async
+from pandacare.api_client import api_request
+from pandacare.async_api_client import async_api_request, async_session_data
+from pandacare.fanout import fan_out
+from pandacare.tracing import trace
+
+logger = logging.getLogger(__name__)
 
 API_BASE_URL = os.getenv("API_BASE_URL")
 SPRINGBOOT_API_URL = f"{API_BASE_URL}/api/reservasi-konsultasi"
@@ -61,76 +67,16 @@ def require_pacilian_auth(view_func):
 
 class APIHandler:
     @staticmethod
-    def request(method, endpoint, data=None, token=None, params=None):
-        if not API_BASE_URL:
-            raise Exception("API_BASE_URL environment variable not set")
-
-        url = f"{API_BASE_URL}{endpoint}"
-        headers = {"Content-Type": "application/json"}
-        if token:
-            headers["Authorization"] = f"Bearer {token}"
-
-        try:
-            request_kwargs = {
-                'method': method,
-                'url': url,
-                'headers': headers,
-                'timeout': 30
-            }
-            
-            if method.upper() == "GET" and params:
-                request_kwargs['params'] = params
-            elif data is not None:
-                request_kwargs['json'] = data
-
-            response = requests.request(**request_kwargs)
-            return APIHandler._handle_response(response)
-
-        except requests.exceptions.Timeout:
-            raise Exception("Request timeout - server may be down")
-        except requests.exceptions.ConnectionError:
-            raise Exception("Connection error - cannot reach server")
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"Network Error: {str(e)}")
-
-    @staticmethod
-    def _handle_response(response):
-        if response.status_code in [200, 201, 204]:
-            if not response.text or response.text.strip() == "":
-                return None
-            try:
-                return response.json()
-            except json.JSONDecodeError:
-                return response.text if response.text else {"success": True}
-        elif response.status_code in [401, 403]:
-            raise PermissionError(f"Unauthorized: {response.text}")
-        else:
-            raise Exception(f"API error {response.status_code}: {response.text}")
-
-    @staticmethod
-    def debug_request(endpoint, id_param=None, token=None):
-        print(f"=== API REQUEST DEBUG ===")
-        print(f"Endpoint: {endpoint}")
-        print(f"Full URL: {API_BASE_URL}{endpoint}")
-        print(f"Token exists: {bool(token)}")
-        print(f"Token preview: {token[:50] if token else 'None'}...")
-        if id_param:
-            print(f"ID Parameter: {id_param}")
-        
-        try:
-            test_response = requests.get(f"{API_BASE_URL}/health", timeout=5)
-            print(f"Backend health check: {test_response.status_code}")
-        except:
-            print("Backend health check failed - backend may be down")
+    def request(method, endpoint, data=None, token=None, params=None, revalidate=False):
+        return api_request(method, endpoint, data=data, token=token, params=params, revalidate=revalidate)
 
 class ResponseHandler:
     @staticmethod
     def handle_api_error(e, request, fallback_redirect="main:home", context_data=None):
-        print(f"API Error: {str(e)}")
-        print(f"API Error Type: {type(e).__name__}")
-        
+        logger.warning("API error: %s", e, extra={'error_type': type(e).__name__})
+
         if "Unauthorized" in str(e) or "401" in str(e):
-            print("AUTHENTICATION FAILED - Token may be expired or invalid")
+            logger.info("Authentication failed - token may be expired or invalid")
             messages.error(request, "Authentication failed. Please login again.")
             return redirect("main:login")
         
@@ -171,8 +117,8 @@ class PermissionChecker:
 @require_http_methods(["GET"])
 @require_pacilian_auth
 def list_reservasi(request, id_pacilian):
-    print(f"FUNCTION CALLED: list_reservasi with id_pacilian={id_pacilian}")
-    
+    logger.debug("list_reservasi called", extra={'id_pacilian': str(id_pacilian)})
+
     if not PermissionChecker.can_access_reservations(request, id_pacilian):
         return redirect("main:pacilian_dashboard")
 
@@ -180,13 +126,10 @@ def list_reservasi(request, id_pacilian):
     endpoint = f"/api/reservasi-konsultasi/{id_pacilian}"
     
     try:
-        APIHandler.debug_request(endpoint, id_pacilian, token)
-        data = APIHandler.request("GET", endpoint, token=token)
-        
-        print(f"=== API RESPONSE DEBUG ===")
-        print(f"Response type: {type(data)}")
-        print(f"Response data: {data}")
-        
+        data = APIHandler.request("GET", endpoint, token=token, revalidate=True)
+        trace("reservasi.list", endpoint=endpoint, response_type=type(data).__name__,
+              count=len(data) if isinstance(data, list) else None)
+
         context = {
             "reservasis": data,
             "user_id": id_pacilian,
@@ -202,6 +145,46 @@ def list_reservasi(request, id_pacilian):
         }
         return ResponseHandler.handle_api_error(e, request, "main:pacilian_dashboard", context_data)
 
+@require_http_methods(["GET"])
+async def alist_reservasi(request, id_pacilian):
+    """list_reservasi for ASGI deployments; awaits the upstream call on the event loop"""
+    session_data = await async_session_data(request)
+    if not session_data['token']:
+        messages.error(request, "Please login first")
+        return redirect("main:login")
+    if session_data['user_role'] != 'pacilian':
+        messages.error(request, "Access denied")
+        return redirect("main:home")
+    if str(session_data['user_id']) != str(id_pacilian):
+        messages.error(request, "You can only view your own reservations")
+        return redirect("main:pacilian_dashboard")
+
+    user_context = {
+        'is_logged_in': True,
+        'user_role': session_data['user_role'],
+        'user_id': session_data['user_id']
+    }
+
+    try:
+        endpoint = f"/api/reservasi-konsultasi/{id_pacilian}"
+        data = await async_api_request("GET", endpoint, token=session_data['token'], revalidate=True)
+        trace("reservasi.list", endpoint=endpoint, response_type=type(data).__name__,
+              count=len(data) if isinstance(data, list) else None)
+        context = {
+            "reservasis": data,
+            "user_id": id_pacilian,
+            **user_context
+        }
+        return await sync_to_async(render)(request, "list.html", context)
+
+    except Exception as e:
+        context_data = {
+            "reservasis": [],
+            "user_id": id_pacilian,
+            "template": "list.html"
+        }
+        return await sync_to_async(ResponseHandler.handle_api_error)(e, request, "main:pacilian_dashboard", context_data)
+
 @require_http_methods(["POST"])
 @require_pacilian_auth
 def accept_change(request, id):
@@ -225,9 +208,10 @@ def _handle_change_request(request, id, action, success_message):
 def get_available_schedules(request, caregiver_id):
     try:
         token = request.session.get("access_token")
-        print(f"Fetching available schedules for caregiver: {caregiver_id}")
+        logger.debug("Fetching available schedules", extra={'caregiver_id': str(caregiver_id)})
 
-        response = APIHandler.request("GET", f"/api/caregivers/{caregiver_id}/schedules", token=token)
+        response = APIHandler.request("GET", f"/api/caregivers/{caregiver_id}/schedules", token=token,
+                                      revalidate=True)
 
         schedules = []
         if response and response.get('status') == 200:
@@ -252,7 +236,7 @@ def get_available_schedules(request, caregiver_id):
         )
 
     except Exception as e:
-        print(f"Error in get_available_schedules: {e}")
+        logger.warning("Error in get_available_schedules: %s", e)
         return ResponseHandler.json_response(success=False, error=str(e), status=500)
 
 @method_decorator(csrf_exempt, name='dispatch')
@@ -293,8 +277,8 @@ class AvailableScheduleListView(View):
 
     @method_decorator(require_pacilian_auth)
     def post(self, request, caregiver_id):
-        print(f"=== POST REQUEST TO AvailableScheduleListView ===")
-        
+        logger.debug("AvailableScheduleListView POST", extra={'caregiver_id': str(caregiver_id)})
+
         schedule_id = request.POST.get('schedule_id')
         reservation_id = request.POST.get('reservation_id')
         
@@ -320,8 +304,13 @@ class AvailableScheduleListView(View):
     def _fetch_schedules_and_caregiver(self, request, caregiver_id):
         token = request.session.get("access_token")
         
-        response = APIHandler.request("GET", f"/api/caregivers/{caregiver_id}/schedules", token=token)
+        results = fan_out({
+            'schedules': lambda: APIHandler.request("GET", f"/api/caregivers/{caregiver_id}/schedules", token=token,
+                                                 revalidate=True),
+            'caregiver': lambda: APIHandler.request("GET", f"/api/caregivers/{caregiver_id}", token=token),
+        })
         
+        response = results['schedules'].unwrap()
         schedules = []
         if response and response.get('status') == 200:
             raw_schedules = response.get('data', [])
@@ -340,18 +329,18 @@ class AvailableScheduleListView(View):
             ]
         
         caregiver_info = None
-        try:
-            caregiver_response = APIHandler.request("GET", f"/api/caregivers/{caregiver_id}", token=token)
+        if results['caregiver'].ok:
+            caregiver_response = results['caregiver'].value
             if caregiver_response and caregiver_response.get('status') == 200:
                 caregiver_info = caregiver_response.get('data', caregiver_response)
-        except Exception as e:
-            print(f"Could not fetch caregiver info: {e}")
+        else:
+            logger.warning("Could not fetch caregiver info: %s", results['caregiver'].error)
         
         return schedules, caregiver_info
 
     def _edit_reservation(self, request, reservation_id, schedule_id):
-        print(f"=== EDITING RESERVATION {reservation_id} ===")
-        
+        logger.info("Editing reservation", extra={'reservation_id': str(reservation_id)})
+
         data = {"idSchedule": str(schedule_id)}
         endpoint = f"/api/reservasi-konsultasi/{reservation_id}/edit"
         token = request.session.get("access_token")
@@ -371,8 +360,8 @@ class AvailableScheduleListView(View):
         return False
 
     def _create_reservation(self, request, schedule_id):
-        print(f"=== CREATING NEW RESERVATION ===")
-        
+        logger.info("Creating reservation", extra={'schedule_id': str(schedule_id)})
+
         pacilian_id = get_user_context(request).get('user_id')
         data = {
             "idSchedule": str(schedule_id),
@@ -412,16 +401,14 @@ class AvailableScheduleListView(View):
             messages.error(request, f"Failed to process request: {str(e)}")
 
     def _debug_context(self, context):
-        print(f"=== TEMPLATE CONTEXT ===")
-        print(f"Schedules count: {len(context['schedules'])}")
-        print(f"Is edit mode: {context['is_edit_mode']}")
-        print(f"Caregiver ID: {context['caregiver_id']}")
+        logger.debug("Available schedules context", extra={
+            'schedules_count': len(context['schedules']),
+            'is_edit_mode': context['is_edit_mode'],
+            'caregiver_id': context['caregiver_id'],
+        })
 
     def _debug_error(self, e):
-        print(f"=== ERROR in AvailableScheduleListView ===")
-        print(f"Error type: {type(e).__name__}")
-        print(f"Error message: {str(e)}")
-        print(f"Traceback: {traceback.format_exc()}")
+        logger.error("Error in AvailableScheduleListView: %s", e, exc_info=True)
 
 class ReservationRequestView(View):
     @method_decorator(csrf_exempt)
@@ -435,8 +422,11 @@ class ReservationRequestView(View):
                 "idSchedule": request.POST.get("schedule_id"),
                 "idPacilian": request.session.get("user_id")
             }
-            print(f"{data.get('idSchedule')=}, {data.get('idPacilian')=}")
-            
+            logger.debug("Reservation request", extra={
+                'schedule_id': data.get('idSchedule'),
+                'pacilian_id': data.get('idPacilian'),
+            })
+
             response = APIHandler.request(
                 "POST",
                 "/api/reservasi-konsultasi/request",
@@ -453,5 +443,5 @@ class ReservationRequestView(View):
                 
         except Exception as e:
             messages.error(request, f"Error requesting reservation: {str(e)}")
-            print(f"Error in ReservationRequestView: {str(e)}")
+            logger.warning("Error in ReservationRequestView: %s", e)
             return redirect(request.META.get('HTTP_REFERER', 'doctor_profile:search'))
\ No newline at end of file
@@ -0,0 +1,225 @@
+from bisect import bisect_left, bisect_right
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from pandacare.cache import LRUCache
+
+WEEKDAYS = ['MONDAY', 'TUESDAY', 'WEDNESDAY', 'THURSDAY', 'FRIDAY', 'SATURDAY', 'SUNDAY']
+
+# Statuses that no longer hold their time slot
+IGNORED_STATUSES = {'INACTIVE', 'CANCELLED'}
+
+# Upper bound on the weeks a new weekly slot is checked for
+MAX_CHECKED_WEEKS = 52
+
+# Per-caregiver index built from the full (unfiltered) schedule list. Writes made
+# through this front-end are applied to the cached entry, or drop it when their
+# outcome is unclear; entries expire after a short TTL to pick up changes made elsewhere.
+schedule_indexes = LRUCache(
+    maxsize=getattr(settings, 'SCHEDULE_INDEX_MAXSIZE', 1024),
+    ttl=getattr(settings, 'SCHEDULE_INDEX_TTL', 60),
+    name='schedule_index',
+)
+
+
+def to_minutes(value):
+    """'HH:MM' or 'HH:MM:SS' to minutes since midnight; None if unparseable"""
+    try:
+        hours, minutes = str(value).split(':')[:2]
+        hours, minutes = int(hours), int(minutes)
+    except (TypeError, ValueError):
+        return None
+    if not (0 <= hours < 24 and 0 <= minutes < 60):
+        return None
+    return hours * 60 + minutes
+
+
+def to_date(value):
+    """'YYYY-MM-DD' (optionally followed by a time) to a date; None if absent or unparseable"""
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except (TypeError, ValueError):
+        return None
+
+
+def upcoming_dates(day, weeks=1, today=None):
+    """The next ``weeks`` dates falling on weekday ``day``, starting today"""
+    today = today or timezone.localdate()
+    first = today + timedelta(days=(WEEKDAYS.index(day) - today.weekday()) % 7)
+    return [first + timedelta(weeks=week) for week in range(min(max(weeks, 1), MAX_CHECKED_WEEKS))]
+
+
+def format_minutes(minutes):
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+class DayIntervals:
+    """Time slots of one day sorted by start, with a running max of end times.
+
+    Lookups are two binary searches, O(log n) even if the upstream list
+    already contains overlapping slots. add/remove shift the lists and
+    recompute the running max from the changed position, O(n), which is fine
+    for the tens of slots a caregiver has on one day.
+    """
+
+    __slots__ = ('starts', 'ends', 'ids', 'max_ends')
+
+    def __init__(self, slots=()):
+        slots = sorted(slots)
+        self.starts = [start for start, _, _ in slots]
+        self.ends = [end for _, end, _ in slots]
+        self.ids = [schedule_id for _, _, schedule_id in slots]
+        self.max_ends = []
+        self._refresh_max_ends(0)
+
+    def _refresh_max_ends(self, position):
+        del self.max_ends[position:]
+        running = self.max_ends[-1] if self.max_ends else -1
+        for end in self.ends[position:]:
+            running = max(running, end)
+            self.max_ends.append(running)
+
+    def find_conflict(self, start, end):
+        """Position of a slot identical to or overlapping [start, end), or None; exact duplicates win"""
+        position = bisect_left(self.starts, start)
+        while position < len(self.starts) and self.starts[position] == start:
+            if self.ends[position] == end:
+                return position
+            position += 1
+
+        # Slots starting before `end` are candidates. The first one whose running
+        # max end passes `start` raised that max itself, so it ends after `start`.
+        candidates = bisect_left(self.starts, end)
+        position = bisect_right(self.max_ends, start, 0, candidates)
+        return position if position < candidates else None
+
+    def add(self, start, end, schedule_id):
+        position = bisect_right(self.starts, start)
+        self.starts.insert(position, start)
+        self.ends.insert(position, end)
+        self.ids.insert(position, schedule_id)
+        self._refresh_max_ends(position)
+
+    def remove(self, schedule_id):
+        if schedule_id not in self.ids:
+            return False
+        position = self.ids.index(schedule_id)
+        for column in (self.starts, self.ends, self.ids):
+            del column[position]
+        self._refresh_max_ends(position)
+        return True
+
+    def slots(self):
+        return zip(self.starts, self.ends, self.ids)
+
+    def overlapping_ids(self):
+        """Ids of slots that overlap another slot on this day, in one sweep"""
+        overlapping, latest_end, latest_id = set(), -1, None
+        for start, end, schedule_id in self.slots():
+            if start < latest_end:
+                overlapping.update((schedule_id, latest_id))
+            if end > latest_end:
+                latest_end, latest_id = end, schedule_id
+        return overlapping
+
+
+class ScheduleIndex:
+    """Interval index over a caregiver's upcoming schedules.
+
+    Dated slots are grouped by date, so weekly instances of the same time on
+    different dates never collide. Slots without a date are grouped by
+    weekday and checked against every date falling on that weekday. Past
+    dates and IGNORED_STATUSES are left out.
+    """
+
+    def __init__(self, schedules=(), today=None):
+        self.today = today or timezone.localdate()
+        by_key = {}
+        for schedule in schedules:
+            slot = self._slot(schedule)
+            if slot:
+                key, start, end, schedule_id = slot
+                by_key.setdefault(key, []).append((start, end, schedule_id))
+        self.days = {key: DayIntervals(slots) for key, slots in by_key.items()}
+
+    def _slot(self, schedule):
+        if str(schedule.get('status', '')).upper() in IGNORED_STATUSES:
+            return None
+        start, end = to_minutes(schedule.get('startTime')), to_minutes(schedule.get('endTime'))
+        if start is None or end is None or start >= end:
+            return None
+
+        schedule_date = to_date(schedule.get('date'))
+        if schedule_date is not None:
+            if schedule_date < self.today:
+                return None
+            key = schedule_date
+        else:
+            key = str(schedule.get('day') or '').upper()
+            if key not in WEEKDAYS:
+                return None
+        return key, start, end, str(schedule.get('id') or '')
+
+    def copy(self):
+        clone = ScheduleIndex(today=self.today)
+        for key, intervals in self.days.items():
+            clone.days[key] = DayIntervals(intervals.slots())
+        return clone
+
+    def _keys_for(self, day, on_date=None, weeks=1):
+        """Index keys a slot on ``day`` (or on ``on_date``) for ``weeks`` weeks can collide with"""
+        if on_date is not None:
+            return [on_date, WEEKDAYS[on_date.weekday()]]
+        return [day, *upcoming_dates(day, weeks, self.today)]
+
+    def find_conflict(self, day, start_time, end_time, on_date=None, weeks=1):
+        """(kind, slot) for the first slot that duplicates or overlaps the given one, else None.
+
+        Without ``on_date`` the slot is taken as weekly, starting this week
+        and repeating for ``weeks`` weeks.
+        """
+        day, on_date = str(day).upper(), to_date(on_date)
+        start, end = to_minutes(start_time), to_minutes(end_time)
+        if start is None or end is None or (on_date is None and day not in WEEKDAYS):
+            return None
+
+        for key in self._keys_for(day, on_date, weeks):
+            intervals = self.days.get(key)
+            position = intervals.find_conflict(start, end) if intervals else None
+            if position is None:
+                continue
+            slot = {
+                'id': intervals.ids[position],
+                'date': key.isoformat() if isinstance(key, date) else None,
+                'startTime': format_minutes(intervals.starts[position]),
+                'endTime': format_minutes(intervals.ends[position]),
+            }
+            duplicate = intervals.starts[position] == start and intervals.ends[position] == end
+            return ('duplicate' if duplicate else 'overlap'), slot
+        return None
+
+    def add(self, day, start_time, end_time, schedule_id='', on_date=None, weeks=1):
+        """Add a slot on ``on_date``, or on each of the next ``weeks`` dates falling on ``day``"""
+        start, end = to_minutes(start_time), to_minutes(end_time)
+        on_date = to_date(on_date)
+        keys = [on_date] if on_date is not None else upcoming_dates(str(day).upper(), weeks, self.today)
+        for key in keys:
+            self.days.setdefault(key, DayIntervals()).add(start, end, str(schedule_id or ''))
+
+    def remove(self, schedule_id):
+        """Drop every instance of a slot; False if it was not indexed"""
+        return any([intervals.remove(str(schedule_id)) for intervals in self.days.values()])
+
+    def overlapping_ids(self):
+        """Ids of slots overlapping another slot on the same date (weekly slots count on every date of their weekday)"""
+        overlapping = set()
+        for key, intervals in self.days.items():
+            weekly = self.days.get(WEEKDAYS[key.weekday()]) if isinstance(key, date) else None
+            if weekly:
+                intervals = DayIntervals([*intervals.slots(), *weekly.slots()])
+            overlapping |= intervals.overlapping_ids()
+        return overlapping
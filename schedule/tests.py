@@ -0,0 +1,276 @@
+import json
+import random
+import uuid
+from datetime import date
+from importlib import import_module
+from unittest import mock
+
+from django.conf import settings
+from django.test import Client, SimpleTestCase, override_settings
+from django.urls import reverse
+
+from pandacare.api_client import APIError, APIPermissionError
+
+from .intervals import DayIntervals, ScheduleIndex, schedule_indexes
+from .views import ScheduleValidator
+
+CAREGIVER_ID = str(uuid.UUID(int=1))
+SIGNED_COOKIES = 'django.contrib.sessions.backends.signed_cookies'
+
+
+# A Wednesday
+TODAY = date(2025, 1, 15)
+
+
+def schedule_id(number):
+    return str(uuid.UUID(int=100 + number))
+
+
+def slot(number, day, start, end, on_date=None, status='AVAILABLE'):
+    return {'id': schedule_id(number), 'day': day, 'date': on_date or '', 'startTime': start, 'endTime': end,
+            'status': status}
+
+
+class DayIntervalsTests(SimpleTestCase):
+    def test_matches_a_linear_scan(self):
+        rng = random.Random(25)
+        for _ in range(300):
+            slots = []
+            for number in range(rng.randint(0, 12)):
+                start = rng.randrange(0, 1400, 10)
+                slots.append((start, start + rng.randrange(10, 240, 10), str(number)))
+            intervals = DayIntervals(slots)
+            start = rng.randrange(0, 1400, 10)
+            end = start + rng.randrange(10, 240, 10)
+
+            position = intervals.find_conflict(start, end)
+            overlapping = [s for s in slots if s[0] < end and start < s[1]]
+            if not overlapping:
+                self.assertIsNone(position)
+            else:
+                self.assertIsNotNone(position)
+                self.assertLess(intervals.starts[position], end)
+                self.assertGreater(intervals.ends[position], start)
+
+
+class ScheduleIndexTests(SimpleTestCase):
+    def index(self, *schedules):
+        return ScheduleIndex(schedules, today=TODAY)
+
+    def test_touching_slots_do_not_conflict(self):
+        index = self.index(slot(1, 'MONDAY', '09:00', '10:00'))
+
+        self.assertIsNone(index.find_conflict('MONDAY', '10:00', '11:00'))
+        self.assertIsNone(index.find_conflict('MONDAY', '08:00', '09:00'))
+        self.assertEqual(index.find_conflict('MONDAY', '09:59', '11:00')[0], 'overlap')
+        self.assertEqual(index.overlapping_ids(), set())
+
+    def test_identical_slots_are_duplicates(self):
+        index = self.index(slot(1, 'MONDAY', '08:00', '12:00'), slot(2, 'MONDAY', '09:00', '10:00'))
+
+        kind, found = index.find_conflict('MONDAY', '09:00', '10:00')
+        self.assertEqual((kind, found['id']), ('duplicate', schedule_id(2)))
+        self.assertEqual(index.overlapping_ids(), {schedule_id(1), schedule_id(2)})
+
+    def test_same_weekday_on_different_dates_does_not_collide(self):
+        index = self.index(
+            slot(1, 'MONDAY', '09:00', '10:00', '2025-01-20'),
+            slot(2, 'MONDAY', '09:00', '10:00', '2025-01-27', status='BOOKED'),
+        )
+
+        self.assertEqual(index.overlapping_ids(), set())
+        self.assertIsNone(index.find_conflict('MONDAY', '09:00', '10:00', on_date='2025-02-03'))
+        # A new weekly slot starts on the next Monday, 2025-01-20
+        kind, found = index.find_conflict('MONDAY', '09:30', '10:30')
+        self.assertEqual((kind, found['date']), ('overlap', '2025-01-20'))
+        # ...and reaches the booked instance a week later only if it repeats
+        index.remove(schedule_id(1))
+        self.assertIsNone(index.find_conflict('MONDAY', '09:30', '10:30'))
+        self.assertEqual(index.find_conflict('MONDAY', '09:30', '10:30', weeks=2)[1]['id'], schedule_id(2))
+
+    def test_past_and_ignored_slots_are_skipped(self):
+        index = self.index(
+            slot(1, 'MONDAY', '09:00', '10:00', '2025-01-13'),
+            slot(2, 'MONDAY', '09:00', '10:00', '2025-01-20', status='INACTIVE'),
+            slot(3, 'MONDAY', '09:00', '10:00', status='CANCELLED'),
+        )
+
+        self.assertEqual(index.days, {})
+        self.assertIsNone(index.find_conflict('MONDAY', '09:00', '10:00'))
+
+    def test_undated_slots_count_on_every_date_of_their_weekday(self):
+        index = self.index(
+            slot(1, 'MONDAY', '09:00', '10:00'),
+            slot(2, 'MONDAY', '09:30', '10:30', '2025-01-20'),
+        )
+
+        self.assertEqual(index.overlapping_ids(), {schedule_id(1), schedule_id(2)})
+        self.assertEqual(index.find_conflict('MONDAY', '09:00', '10:00', on_date='2025-03-03')[1]['id'],
+                         schedule_id(1))
+
+    def test_added_slots_cover_their_weeks(self):
+        index = self.index()
+        index.add('MONDAY', '09:00', '10:00', schedule_id(1), weeks=2)
+        index.add('FRIDAY', '09:00', '10:00', schedule_id(2), on_date='2025-01-31')
+
+        self.assertEqual(index.find_conflict('MONDAY', '09:00', '10:00', on_date='2025-01-27')[1]['id'], schedule_id(1))
+        self.assertIsNone(index.find_conflict('MONDAY', '09:00', '10:00', on_date='2025-02-03'))
+        self.assertIsNone(index.find_conflict('FRIDAY', '09:00', '10:00'))
+        self.assertEqual(index.find_conflict('FRIDAY', '09:00', '10:00', weeks=3)[1]['id'], schedule_id(2))
+
+        self.assertTrue(index.remove(schedule_id(1)))
+        self.assertIsNone(index.find_conflict('MONDAY', '09:00', '10:00', weeks=4))
+
+    def test_weeks_count_only_for_interval_slots(self):
+        index = self.index(slot(1, 'MONDAY', '09:00', '10:00', '2025-01-27'))
+        body = {'day': 'MONDAY', 'startTime': '09:00', 'endTime': '10:00', 'weeks': '3'}
+
+        self.assertEqual(ScheduleValidator.check_conflicts(index, body), (True, None))
+        self.assertFalse(ScheduleValidator.check_conflicts(index, {**body, 'isInterval': True})[0])
+
+
+class FakeScheduleAPI:
+    """Stands in for APIClient.request: serves a schedule list and fails chosen writes"""
+
+    def __init__(self, schedules, failing_deletes=(), failing_creates=(), error=None):
+        self.schedules = schedules
+        self.failing_deletes = set(failing_deletes)
+        self.failing_creates = set(failing_creates)
+        self.error = error or APIError("API error 500: boom", 500)
+        self.calls = []
+        self.created = 0
+
+    def __call__(self, method, endpoint, data=None, token=None, params=None, revalidate=False):
+        self.calls.append((method, endpoint, data))
+        if method == "GET":
+            return {"status": 200, "data": self.schedules}
+        if method == "DELETE" and endpoint.rsplit('/', 1)[-1] in self.failing_deletes:
+            raise self.error
+        if method == "POST":
+            if (data["day"], data["startTime"]) in self.failing_creates:
+                raise self.error
+            self.created += 1
+            return {"status": 201, "data": {**data, "id": schedule_id(50 + self.created)}}
+        return {"status": 200}
+
+    def sent(self, method):
+        return [call for call in self.calls if call[0] == method]
+
+
+@override_settings(SESSION_ENGINE=SIGNED_COOKIES, ALLOWED_HOSTS=['*'])
+class ScheduleBulkViewTests(SimpleTestCase):
+    schedules = [
+        {'id': schedule_id(1), 'day': 'MONDAY', 'startTime': '09:00', 'endTime': '12:00', 'status': 'AVAILABLE'},
+        {'id': schedule_id(2), 'day': 'TUESDAY', 'startTime': '09:00', 'endTime': '10:00', 'status': 'AVAILABLE'},
+    ]
+
+    def setUp(self):
+        schedule_indexes.clear()
+        self.addCleanup(schedule_indexes.clear)
+        self.client = Client()
+        session = import_module(SIGNED_COOKIES).SessionStore()
+        session.update({'access_token': 'token', 'user_id': CAREGIVER_ID, 'user_role': 'caregiver'})
+        session.save()
+        self.client.cookies[settings.SESSION_COOKIE_NAME] = session.session_key
+
+    def post(self, api, body, view='schedule:schedule_bulk'):
+        with mock.patch('schedule.views.APIClient.request', api):
+            response = self.client.post(
+                reverse(view, kwargs={'caregiver_id': CAREGIVER_ID}),
+                json.dumps(body),
+                content_type='application/json',
+            )
+        return response.status_code, response.json()
+
+    def test_failed_delete_keeps_its_slot_taken(self):
+        api = FakeScheduleAPI(self.schedules, failing_deletes={schedule_id(1)})
+        status, data = self.post(api, {
+            'delete': [schedule_id(1)],
+            'create': [{'day': 'MONDAY', 'startTime': '10:00', 'endTime': '11:00'}],
+        })
+
+        self.assertEqual(status, 200)
+        self.assertEqual((data['deleted'], data['created'], data['failed']), (0, 0, 2))
+        self.assertIn("Overlaps", data['results']['create'][0]['error'])
+        self.assertEqual(api.sent("POST"), [])
+
+    def test_successful_delete_frees_its_slot(self):
+        api = FakeScheduleAPI(self.schedules)
+        status, data = self.post(api, {
+            'delete': [schedule_id(1)],
+            'create': [{'day': 'MONDAY', 'startTime': '10:00', 'endTime': '11:00'}],
+        })
+
+        self.assertTrue(data['success'])
+        self.assertEqual((data['deleted'], data['created']), (1, 1))
+        self.assertEqual(len(api.sent("POST")), 1)
+
+    def test_mixed_outcomes_are_reported_per_slot(self):
+        api = FakeScheduleAPI(self.schedules, failing_deletes={schedule_id(2)}, failing_creates={('FRIDAY', '08:00')})
+        status, data = self.post(api, {
+            'delete': [schedule_id(1), schedule_id(2), 'not-a-uuid'],
+            'create': [
+                {'day': 'MONDAY', 'startTime': '09:30', 'endTime': '10:30'},
+                {'day': 'TUESDAY', 'startTime': '09:30', 'endTime': '10:30'},
+                {'day': 'FRIDAY', 'startTime': '08:00', 'endTime': '09:00'},
+                {'day': 'MONDAY', 'startTime': '10:00', 'endTime': '11:00'},
+            ],
+        })
+
+        deletes, creates = data['results']['delete'], data['results']['create']
+        self.assertEqual([r['success'] for r in deletes], [True, False, False])
+        self.assertEqual(deletes[2]['error'], "Invalid schedule ID")
+        self.assertEqual([r['success'] for r in creates], [True, False, False, False])
+        self.assertIn("Overlaps the Tuesday schedule", creates[1]['error'])
+        self.assertIn("Error creating schedule", creates[2]['error'])
+        self.assertRegex(creates[3]['error'], r"Overlaps the Monday [\d-]+ schedule from 09:30")
+        self.assertEqual((data['deleted'], data['created'], data['failed']), (1, 1, 5))
+        self.assertFalse(data['success'])
+        self.assertEqual(len(api.sent("POST")), 2)
+
+    def test_unauthorized_delete_stops_the_creates(self):
+        api = FakeScheduleAPI(self.schedules, failing_deletes={schedule_id(1)},
+                              error=APIPermissionError("Unauthorized: expired", 401))
+        status, data = self.post(api, {
+            'delete': [schedule_id(1)],
+            'create': [{'day': 'WEDNESDAY', 'startTime': '10:00', 'endTime': '11:00'}],
+        })
+
+        self.assertEqual(data['redirect'], "/login/")
+        self.assertFalse(data['results']['create'][0]['success'])
+        self.assertEqual(api.sent("POST"), [])
+
+    def test_forbidden_delete_stops_the_creates(self):
+        api = FakeScheduleAPI(self.schedules, failing_deletes={schedule_id(1)},
+                              error=APIPermissionError("Forbidden", 403))
+        status, data = self.post(api, {
+            'delete': [schedule_id(1)],
+            'create': [{'day': 'WEDNESDAY', 'startTime': '10:00', 'endTime': '11:00'}],
+        })
+
+        self.assertEqual(data['redirect'], "/login/")
+        self.assertIn("Not sent", data['results']['create'][0]['error'])
+        self.assertEqual(api.sent("POST"), [])
+
+    def test_successful_writes_update_the_cached_index(self):
+        api = FakeScheduleAPI(self.schedules)
+        self.post(api, {
+            'delete': [schedule_id(1)],
+            'create': [{'day': 'MONDAY', 'startTime': '10:00', 'endTime': '11:00'}],
+        })
+        self.post(api, {'day': 'FRIDAY', 'startTime': '08:00', 'endTime': '09:00'}, view='schedule:schedule_create')
+
+        index = schedule_indexes.get(CAREGIVER_ID)
+        self.assertIsNone(index.find_conflict('MONDAY', '09:00', '10:00'))
+        self.assertEqual(index.find_conflict('MONDAY', '10:30', '11:30')[1]['id'], schedule_id(51))
+        self.assertEqual(index.find_conflict('FRIDAY', '08:00', '09:00')[1]['id'], schedule_id(52))
+        self.assertEqual(len(api.sent("GET")), 1)
+
+    def test_failed_writes_drop_the_cached_index(self):
+        api = FakeScheduleAPI(self.schedules, failing_creates={('FRIDAY', '08:00')})
+        self.post(api, {'create': [
+            {'day': 'MONDAY', 'startTime': '13:00', 'endTime': '14:00'},
+            {'day': 'FRIDAY', 'startTime': '08:00', 'endTime': '09:00'},
+        ]})
+
+        self.assertIsNone(schedule_indexes.get(CAREGIVER_ID))
@@ -1,10 +1,15 @@
+from django.conf import settings
 from django.urls import path
-from .views import ScheduleListView, ScheduleCreateView, ScheduleDeleteView
+from .views import ScheduleListView, AsyncScheduleListView, ScheduleCreateView, ScheduleDeleteView, ScheduleBulkView
 
 app_name = 'schedule'
 
+if settings.ASYNC_VIEWS:
+    ScheduleListView = AsyncScheduleListView
+
 urlpatterns = [
     path('schedules/<uuid:caregiver_id>/', ScheduleListView.as_view(), name='schedule_list'),
     path('schedules/<uuid:caregiver_id>/create/', ScheduleCreateView.as_view(), name='schedule_create'),
+    path('schedules/<uuid:caregiver_id>/bulk/', ScheduleBulkView.as_view(), name='schedule_bulk'),
     path('schedules/<uuid:caregiver_id>/<uuid:schedule_id>/delete/', ScheduleDeleteView.as_view(), name='schedule_delete'),
 ]
\ No newline at end of file
@@ -4,13 +4,23 @@ from django.views import View
 from django.contrib import messages
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
-import requests
-import os
 import json
+import logging
+import threading
+import uuid
 from datetime import datetime
 from functools import wraps
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from pandacare.api_client import APIPermissionError, api_request
+from pandacare.async_api_client import async_api_request, async_session_data
+from pandacare.fanout import fan_out_map
+from pandacare.http_cache import cached_render
+from pandacare.profiles import invalidate_profile
 
-API_BASE_URL = os.getenv("API_BASE_URL")
+from .intervals import WEEKDAYS, ScheduleIndex, schedule_indexes
+
+logger = logging.getLogger(__name__)
 
 class Auth:
     @staticmethod
@@ -38,46 +48,8 @@ class Auth:
 
 class APIClient:
     @staticmethod
-    def request(method, endpoint, data=None, token=None, params=None):
-        if not API_BASE_URL:
-            raise Exception("API_BASE_URL environment variable not set")
-        
-        url = f"{API_BASE_URL}{endpoint}"
-        headers = {"Content-Type": "application/json"}
-        
-        if token:
-            headers["Authorization"] = f"Bearer {token}"
-        
-        try:
-            kwargs = {"headers": headers, "timeout": 30}
-            
-            if method.upper() == "GET" and params:
-                kwargs["params"] = params
-            elif data is not None:
-                kwargs["json"] = data
-                
-            response = requests.request(method, url, **kwargs)
-            
-            if response.status_code in [200, 201, 204]:
-                try:
-                    return response.json()
-                except json.JSONDecodeError:
-                    return response.text if response.text else {"success": True}
-            elif response.status_code == 401:
-                raise PermissionError("Session expired. Please login again.")
-            elif response.status_code == 403:
-                raise PermissionError(f"Access denied: {response.text}")
-            else:
-                raise Exception(f"API error {response.status_code}: {response.text}")
-                
-        except requests.exceptions.Timeout:
-            raise Exception("Request timeout - server may be down")
-        except requests.exceptions.ConnectionError:
-            raise Exception("Connection error - cannot reach server")
-        except Exception as e:
-            if isinstance(e, PermissionError):
-                raise
-            raise Exception(f"API Error: {str(e)}")
+    def request(method, endpoint, data=None, token=None, params=None, revalidate=False):
+        return api_request(method, endpoint, data=data, token=token, params=params, revalidate=revalidate)
 
 class ScheduleTransformer:
     @staticmethod
@@ -138,6 +110,28 @@ def require_caregiver_auth(view_func):
         return view_func(self, request, caregiver_id, *args, **kwargs)
     return wrapper
 
+def require_caregiver_auth_async(view_func):
+    @wraps(view_func)
+    async def wrapper(self, request, caregiver_id, *args, **kwargs):
+        session_data = await async_session_data(request)
+        is_json = request.content_type == 'application/json'
+        
+        if not session_data['token'] or not all(session_data.values()):
+            await request.session.aflush()
+            if is_json:
+                return JsonResponse({"error": "Session expired", "redirect": "/login/"}, status=401)
+            messages.error(request, "Please login first")
+            return redirect("main:login")
+        
+        if (session_data['user_role'] != "caregiver" or str(session_data['user_id']) != str(caregiver_id)):
+            if is_json:
+                return JsonResponse({"error": "Access denied"}, status=403)
+            messages.error(request, "Access denied")
+            return redirect("main:home")
+        
+        return await view_func(self, request, caregiver_id, *args, **kwargs)
+    return wrapper
+
 @method_decorator(csrf_exempt, name='dispatch')
 class ScheduleListView(View, Auth):
     template_name = 'schedule_list.html'
@@ -149,52 +143,88 @@ class ScheduleListView(View, Auth):
         day_filter = request.GET.get("day", "").strip()
         
         try:
-            params = {}
-            if status_filter:
-                params["status"] = status_filter
-            if day_filter:
-                params["day"] = day_filter
-            
             schedules_response = APIClient.request(
                 "GET", 
                 f"/api/caregivers/{caregiver_id}/schedules", 
-                params=params,
-                token=session_data['token']
+                params=self._build_params(status_filter, day_filter),
+                token=session_data['token'],
+                revalidate=True
             )
             
             schedules = ScheduleTransformer.transform_all(schedules_response)
+            self._index_schedules(caregiver_id, schedules, filtered=bool(status_filter or day_filter))
+            context = self._build_context(caregiver_id, schedules, status_filter, day_filter)
+            return cached_render(request, self.template_name, context)
             
-            context = {
-                'schedules': schedules,
-                'caregiver_id': str(caregiver_id),
-                'user_id': str(caregiver_id),
-                'status_filter': status_filter,  
-                'day_filter': day_filter,
-                'is_logged_in': True,
-                'user_role': 'caregiver',
-                'total_schedules': len(schedules),
-            }
-            
+        except PermissionError:
+            return self.clear_session_and_redirect(request)
+        except Exception as e:
+            messages.error(request, f"Error loading schedules: {str(e)}")
+            context = self._build_context(caregiver_id, [], status_filter, day_filter, error=str(e))
             return render(request, self.template_name, context)
+
+    def _build_params(self, status_filter, day_filter):
+        params = {}
+        if status_filter:
+            params["status"] = status_filter
+        if day_filter:
+            params["day"] = day_filter
+        return params
+
+    def _index_schedules(self, caregiver_id, schedules, filtered):
+        """Flag slots that overlap another one; the full list also refreshes the index the create path checks against"""
+        index = ScheduleIndex(schedules)
+        if not filtered:
+            schedule_indexes.set(str(caregiver_id), index)
+        overlapping = index.overlapping_ids()
+        for schedule in schedules:
+            schedule['overlaps'] = str(schedule['id']) in overlapping
+
+    def _build_context(self, caregiver_id, schedules, status_filter, day_filter, error=None):
+        context = {
+            'schedules': schedules,
+            'caregiver_id': str(caregiver_id),
+            'user_id': str(caregiver_id),
+            'status_filter': status_filter,  
+            'day_filter': day_filter,
+            'is_logged_in': True,
+            'user_role': 'caregiver',
+            'total_schedules': len(schedules),
+        }
+        if error:
+            context['error'] = error
+        return context
+
+@method_decorator(csrf_exempt, name='dispatch')
+class AsyncScheduleListView(ScheduleListView):
+    """ScheduleListView for ASGI deployments; awaits the upstream call on the event loop"""
+
+    @require_caregiver_auth_async
+    async def get(self, request, caregiver_id):
+        token = await request.session.aget("access_token")
+        status_filter = request.GET.get("status", "").strip()
+        day_filter = request.GET.get("day", "").strip()
+        
+        try:
+            schedules_response = await async_api_request(
+                "GET",
+                f"/api/caregivers/{caregiver_id}/schedules",
+                params=self._build_params(status_filter, day_filter),
+                token=token,
+                revalidate=True
+            )
+            schedules = ScheduleTransformer.transform_all(schedules_response)
+            self._index_schedules(caregiver_id, schedules, filtered=bool(status_filter or day_filter))
+            context = self._build_context(caregiver_id, schedules, status_filter, day_filter)
             
-        except PermissionError as e:
-            return self.clear_session_and_redirect(request, str(e))
+        except PermissionError:
+            await request.session.aflush()
+            messages.error(request, "Session expired. Please login again.")
+            return redirect("main:login")
         except Exception as e:
             messages.error(request, f"Error loading schedules: {str(e)}")
-            
-            context = {
-                'schedules': [],
-                'caregiver_id': str(caregiver_id),
-                'user_id': str(caregiver_id),
-                'status_filter': status_filter,
-                'day_filter': day_filter,
-                'is_logged_in': True,
-                'user_role': 'caregiver',
-                'total_schedules': 0,
-                'error': str(e)
-            }
-            
-            return render(request, self.template_name, context)
+            context = self._build_context(caregiver_id, [], status_filter, day_filter, error=str(e))
+        return await sync_to_async(cached_render)(request, self.template_name, context)
 
 @method_decorator(csrf_exempt, name='dispatch')
 class ScheduleDeleteView(View, Auth):
@@ -208,12 +238,16 @@ class ScheduleDeleteView(View, Auth):
                 f"/api/caregivers/{caregiver_id}/schedules/{schedule_id}",
                 token=session_data['token']
             )
+            update_schedule_index(caregiver_id, lambda index: index.remove(schedule_id) or True)
+            invalidate_profile(caregiver_id)
             
             messages.success(request, "Schedule deleted successfully")
             
-        except PermissionError as e:
-            return self.clear_session_and_redirect(request, str(e))
+        except PermissionError:
+            return self.clear_session_and_redirect(request)
         except Exception as e:
+            # The delete may still have gone through
+            schedule_indexes.delete(str(caregiver_id))
             messages.error(request, f"Error deleting schedule: {str(e)}")
         
         return redirect("schedule:schedule_list", caregiver_id=caregiver_id)
@@ -227,11 +261,14 @@ class ScheduleValidator:
         
         if not all([day, start_time, end_time]):
             return False, "Please fill in all required fields"
+
+        if str(day).upper() not in WEEKDAYS:
+            return False, "Please select a valid day"
         
         try:
             datetime.strptime(start_time, '%H:%M')
             datetime.strptime(end_time, '%H:%M')
-        except ValueError:
+        except (TypeError, ValueError):
             return False, "Please enter valid time format (HH:MM)"
         
         if start_time >= end_time:
@@ -239,6 +276,88 @@ class ScheduleValidator:
         
         return True, None
 
+    @staticmethod
+    def check_conflicts(index, body):
+        """Reject a slot that duplicates or overlaps an upcoming one in the caregiver's index"""
+        if index is None:
+            return True, None
+        day = str(body.get('day')).upper()
+        conflict = index.find_conflict(
+            day, body.get('startTime'), body.get('endTime'), on_date=body.get('date'), weeks=slot_weeks(body)
+        )
+        if conflict is None:
+            return True, None
+        kind, slot = conflict
+        label = f"{day.title()} {slot['date']}" if slot['date'] else day.title()
+        if kind == 'duplicate':
+            return False, f"A {label} schedule from {slot['startTime']} to {slot['endTime']} already exists"
+        return False, f"Overlaps the {label} schedule from {slot['startTime']} to {slot['endTime']}"
+
+def slot_weeks(body):
+    """Weeks a requested slot repeats for: ``weeks`` when it is created as an interval, else one"""
+    weeks = body.get('weeks')
+    if body.get('isInterval') and str(weeks).isdigit() and int(weeks) > 0:
+        return int(weeks)
+    return 1
+
+def add_created_slot(index, body, response):
+    """Mirror a successful create in ``index``; False when the new schedule cannot be identified"""
+    data = response.get('data', response) if isinstance(response, dict) else None
+    schedule_id = data.get('id') if isinstance(data, dict) else None
+    # An interval create makes one schedule per week, which the response does not map back
+    if not schedule_id or slot_weeks(body) > 1:
+        return False
+    index.add(body.get('day'), body.get('startTime'), body.get('endTime'), schedule_id, on_date=body.get('date'))
+    return True
+
+def update_schedule_index(caregiver_id, apply):
+    """Apply a successful write to a copy of the cached index, or drop it if ``apply`` returns False"""
+    def updated(index):
+        index = index.copy()
+        return index if apply(index) else None
+    schedule_indexes.update(str(caregiver_id), updated)
+
+def load_schedule_index(caregiver_id, token):
+    """The caregiver's ScheduleIndex, cached or built from the conditionally cached schedule list.
+
+    Returns None when the list cannot be loaded, leaving overlap checks to the
+    backend; permission errors propagate.
+    """
+    key = str(caregiver_id)
+    index = schedule_indexes.get(key)
+    if index is not None:
+        return index
+    try:
+        response = APIClient.request("GET", f"/api/caregivers/{caregiver_id}/schedules", token=token, revalidate=True)
+    except PermissionError:
+        raise
+    except Exception as e:
+        logger.warning("Schedule index unavailable", extra={'caregiver_id': key, 'error': str(e)})
+        return None
+    index = ScheduleIndex(ScheduleTransformer.transform_all(response))
+    schedule_indexes.set(key, index)
+    return index
+
+def build_schedule_request(caregiver_id, body):
+    """Upstream endpoint, payload and success message for one validated slot"""
+    schedule_data = {
+        "day": str(body.get('day')).upper(),
+        "startTime": body.get('startTime'),
+        "endTime": body.get('endTime'),
+        "status": "AVAILABLE"
+    }
+
+    weeks = body.get('weeks', '')
+    if weeks and str(weeks).isdigit() and int(weeks) > 0:
+        schedule_data["weeks"] = int(weeks)
+
+    endpoint = f"/api/caregivers/{caregiver_id}/schedules"
+    create_multiple = body.get('isInterval', False)
+    if create_multiple and weeks:
+        endpoint += "/interval"
+        return endpoint, schedule_data, f"Schedule created for {weeks} weeks successfully"
+    return endpoint, schedule_data, "Schedule created successfully"
+
 @method_decorator(csrf_exempt, name='dispatch')
 class ScheduleCreateView(View, Auth):
     template_name = 'create_schedule.html'
@@ -250,7 +369,7 @@ class ScheduleCreateView(View, Auth):
             'user_id': str(caregiver_id),
             'is_logged_in': True,
             'user_role': 'caregiver',
-            'days': ['MONDAY', 'TUESDAY', 'WEDNESDAY', 'THURSDAY', 'FRIDAY', 'SATURDAY', 'SUNDAY']
+            'days': WEEKDAYS
         }
         
         return render(request, self.template_name, context)
@@ -269,32 +388,26 @@ class ScheduleCreateView(View, Auth):
             return JsonResponse({"error": error_message}, status=400)
         
         try:
-            schedule_data = {
-                "day": body.get('day').upper(),
-                "startTime": body.get('startTime'),
-                "endTime": body.get('endTime'),
-                "status": "AVAILABLE"
-            }
-            
-            weeks = body.get('weeks', '')
-            if weeks and str(weeks).isdigit() and int(weeks) > 0:
-                schedule_data["weeks"] = int(weeks)
-
-            endpoint = f"/api/caregivers/{caregiver_id}/schedules"
-            create_multiple = body.get('isInterval', False)
-            if create_multiple and weeks:
-                endpoint += "/interval"
-
-            response = APIClient.request(
-                "POST", 
-                endpoint, 
-                data=schedule_data, 
-                token=session_data['token']
-            )
+            index = load_schedule_index(caregiver_id, session_data['token'])
+            is_free, error_message = ScheduleValidator.check_conflicts(index, body)
+            if not is_free:
+                return JsonResponse({"error": error_message}, status=409)
+
+            endpoint, schedule_data, success_message = build_schedule_request(caregiver_id, body)
 
-            success_message = "Schedule created successfully"
-            if create_multiple and weeks:
-                success_message = f"Schedule created for {weeks} weeks successfully"
+            try:
+                response = APIClient.request(
+                    "POST", 
+                    endpoint, 
+                    data=schedule_data, 
+                    token=session_data['token']
+                )
+            except Exception:
+                # The create may still have gone through
+                schedule_indexes.delete(str(caregiver_id))
+                raise
+            update_schedule_index(caregiver_id, lambda index: add_created_slot(index, body, response))
+            invalidate_profile(caregiver_id)
 
             return JsonResponse({
                 "success": True,
@@ -310,4 +423,174 @@ class ScheduleCreateView(View, Auth):
         except Exception as e:
             return JsonResponse({
                 "error": f"Error creating schedule: {str(e)}"
-            }, status=500)
\ No newline at end of file
+            }, status=500)
+
+@method_decorator(csrf_exempt, name='dispatch')
+class ScheduleBulkView(View, Auth):
+    """Create and delete many schedule slots in one request, sending the upstream writes concurrently"""
+
+    @require_caregiver_auth
+    def post(self, request, caregiver_id):
+        session_data = self.get_session_data(request)
+
+        try:
+            body = json.loads(request.body.decode("utf-8"))
+        except Exception as e:
+            return JsonResponse({"error": f"Invalid JSON input: {str(e)}"}, status=400)
+
+        if not isinstance(body, dict):
+            return JsonResponse({"error": "Expected a JSON object"}, status=400)
+        slots = body.get('create') or []
+        schedule_ids = body.get('delete') or []
+        if not isinstance(slots, list) or not isinstance(schedule_ids, list):
+            return JsonResponse({"error": "create and delete must be lists"}, status=400)
+        if not slots and not schedule_ids:
+            return JsonResponse({"error": "Nothing to create or delete"}, status=400)
+
+        max_items = getattr(settings, 'SCHEDULE_BULK_MAX_ITEMS', 50)
+        if len(slots) + len(schedule_ids) > max_items:
+            return JsonResponse({"error": f"At most {max_items} slots per request"}, status=400)
+
+        token = session_data['token']
+        try:
+            index = load_schedule_index(caregiver_id, token)
+        except PermissionError as e:
+            return JsonResponse({"error": str(e), "redirect": "/login/"}, status=401)
+
+        limit = getattr(settings, 'SCHEDULE_BULK_CONCURRENCY', 8)
+        denied = threading.Event()
+
+        def send(method, endpoint, data=None):
+            # Once the API refuses this session, the writes not yet sent are skipped
+            if denied.is_set():
+                raise APIPermissionError("Not sent: session is no longer authorized", 403)
+            try:
+                return APIClient.request(method, endpoint, data=data, token=token)
+            except APIPermissionError:
+                denied.set()
+                raise
+
+        # Deletes finish first so a slot can be replaced by an overlapping one in the same request
+        delete_results, delete_jobs = self._validate_deletes(schedule_ids)
+        delete_outcomes = fan_out_map(
+            lambda job: send("DELETE", f"/api/caregivers/{caregiver_id}/schedules/{job['id']}"),
+            delete_jobs,
+            limit=limit,
+        )
+        unauthorized = self._apply_outcomes(delete_results, delete_jobs, delete_outcomes, "Error deleting schedule")
+
+        # Only slots whose delete went through are free for the creates
+        index = index.copy() if index is not None else ScheduleIndex()
+        for job, outcome in zip(delete_jobs, delete_outcomes):
+            if outcome.ok:
+                index.remove(job["id"])
+        create_results, create_jobs = self._validate_slots(caregiver_id, slots, index)
+
+        if unauthorized:
+            for job in create_jobs:
+                create_results[job["index"]]["error"] = "Not sent: session is no longer authorized"
+            create_jobs = []
+        create_outcomes = fan_out_map(
+            lambda job: send("POST", job['endpoint'], job['data']),
+            create_jobs,
+            limit=limit,
+        )
+        unauthorized |= self._apply_outcomes(create_results, create_jobs, create_outcomes, "Error creating schedule")
+        if delete_jobs or create_jobs:
+            if all(outcome.ok for outcome in [*delete_outcomes, *create_outcomes]):
+                update_schedule_index(
+                    caregiver_id, lambda index: self._record_writes(index, delete_jobs, create_jobs, create_outcomes)
+                )
+            else:
+                # A failed write may still have gone through
+                schedule_indexes.delete(str(caregiver_id))
+            invalidate_profile(caregiver_id)
+
+        created = sum(1 for result in create_results if result['success'])
+        deleted = sum(1 for result in delete_results if result['success'])
+        response_data = {
+            "success": created == len(create_results) and deleted == len(delete_results),
+            "created": created,
+            "deleted": deleted,
+            "failed": len(create_results) + len(delete_results) - created - deleted,
+            "results": {"create": create_results, "delete": delete_results},
+        }
+        if unauthorized:
+            response_data["redirect"] = "/login/"
+        return JsonResponse(response_data)
+
+    def _validate_slots(self, caregiver_id, slots, schedule_index):
+        """Per-slot result stubs, plus the upstream calls for the slots that passed validation.
+
+        Accepted slots are added to ``schedule_index`` so later slots in the same
+        request are checked against them too.
+        """
+        results, jobs = [], []
+        for index, slot in enumerate(slots):
+            slot = slot if isinstance(slot, dict) else {}
+            result = {
+                "index": index,
+                "day": str(slot.get('day') or '').upper(),
+                "startTime": slot.get('startTime'),
+                "endTime": slot.get('endTime'),
+                "success": False,
+            }
+            results.append(result)
+
+            is_valid, error_message = ScheduleValidator.validate_json_data(slot)
+            if not is_valid:
+                result["error"] = error_message
+                continue
+
+            is_free, error_message = ScheduleValidator.check_conflicts(schedule_index, slot)
+            if not is_free:
+                result["error"] = error_message
+                continue
+            schedule_index.add(result["day"], result["startTime"], result["endTime"],
+                               on_date=slot.get('date'), weeks=slot_weeks(slot))
+
+            endpoint, schedule_data, message = build_schedule_request(caregiver_id, slot)
+            jobs.append({"index": index, "endpoint": endpoint, "data": schedule_data, "message": message, "slot": slot})
+        return results, jobs
+
+    def _validate_deletes(self, schedule_ids):
+        results, jobs, seen = [], [], set()
+        for index, schedule_id in enumerate(schedule_ids):
+            result = {"index": index, "id": schedule_id, "success": False}
+            results.append(result)
+            try:
+                schedule_id = str(uuid.UUID(str(schedule_id)))
+            except ValueError:
+                result["error"] = "Invalid schedule ID"
+                continue
+            result["id"] = schedule_id
+            if schedule_id in seen:
+                result["error"] = "Duplicate schedule ID"
+                continue
+            seen.add(schedule_id)
+            jobs.append({"index": index, "id": schedule_id, "message": "Schedule deleted successfully"})
+        return results, jobs
+
+    @staticmethod
+    def _record_writes(index, delete_jobs, create_jobs, create_outcomes):
+        """Mirror a fully successful bulk request in ``index``; False if a created schedule cannot be identified"""
+        for job in delete_jobs:
+            index.remove(job["id"])
+        return all([
+            add_created_slot(index, job["slot"], outcome.value) for job, outcome in zip(create_jobs, create_outcomes)
+        ])
+
+    @staticmethod
+    def _apply_outcomes(results, jobs, outcomes, error_prefix):
+        """Record each upstream outcome on its result; True if the API refused any call (401 or 403)"""
+        unauthorized = False
+        for job, outcome in zip(jobs, outcomes):
+            result = results[job["index"]]
+            if outcome.ok:
+                result.update(success=True, message=job["message"])
+                if outcome.value is not None and "endpoint" in job:
+                    result["data"] = outcome.value
+                continue
+            unauthorized = unauthorized or isinstance(outcome.error, APIPermissionError)
+            result.update(success=False, error=f"{error_prefix}: {outcome.error}")
+        return unauthorized